@@ -1,9 +1,10 @@
 import pygame
 from settings import *
+from render import get_target
 
 class AboutMenu:
   def __init__(self):
-    self.display_surface = pygame.display.get_surface()
+    self.display_surface = get_target()
     self.active = False
 
     # --- SCROLLING & CONTENT ---
@@ -50,6 +51,7 @@ class AboutMenu:
     self.scroll_thumb_rect = self.scroll_track_rect.copy() # Position/height will be set in draw()
     self.SCROLL_BG_COLOR = (40, 40, 45)
     self.SCROLL_THUMB_COLOR = (100, 100, 110)
+    self.rounded_rects = {} # (color, size) -> surface, drawn once
 
     # --- CONTENT TO DISPLAY (Vertical Order) ---
     self.content = {
@@ -106,6 +108,15 @@ class AboutMenu:
         self.display_surface.blit(stroke_surf, stroke_rect)
     self.display_surface.blit(text_surf, text_rect)
 
+  def rounded_rect(self, color, size):
+    """Scrollbar pieces as surfaces, so drawing them is a plain blit."""
+    key = (color, size)
+    if key not in self.rounded_rects:
+      surf = pygame.Surface(size, pygame.SRCALPHA)
+      pygame.draw.rect(surf, color, surf.get_rect(), border_radius=5)
+      self.rounded_rects[key] = surf
+    return self.rounded_rects[key]
+
   def clamp_scroll(self):
     """Ensures self.scroll_y stays within valid bounds."""
     self.scroll_y = max(0, self.scroll_y)
@@ -145,7 +156,7 @@ class AboutMenu:
     # --- 4. DRAW SCROLLBAR ---
     if self.max_scroll > 0: # Only draw if scrolling is possible
       # Draw Track
-      pygame.draw.rect(self.display_surface, self.SCROLL_BG_COLOR, self.scroll_track_rect, border_radius=5)
+      self.display_surface.blit(self.rounded_rect(self.SCROLL_BG_COLOR, self.scroll_track_rect.size), self.scroll_track_rect)
       
       # Calculate Thumb height (proportional to content)
       visible_ratio = self.scrollable_area_rect.height / self.content_height
@@ -158,7 +169,7 @@ class AboutMenu:
       
       # Update thumb rect and draw
       self.scroll_thumb_rect = pygame.Rect(self.scroll_track_rect.left, thumb_y, self.scroll_track_rect.width, thumb_height)
-      pygame.draw.rect(self.display_surface, self.SCROLL_THUMB_COLOR, self.scroll_thumb_rect, border_radius=5)
+      self.display_surface.blit(self.rounded_rect(self.SCROLL_THUMB_COLOR, self.scroll_thumb_rect.size), self.scroll_thumb_rect)
 
     # --- 5. DRAW CONTINUE BUTTON ---
     self.display_surface.blit(self.continue_button, self.continue_rect)
@@ -0,0 +1,97 @@
+import pygame
+from random import choice, randint
+
+from settings import *
+from support import scaled_image
+
+class Backdrop:
+	# sky, horizon bands, horizon line and sea prerendered into one strip, only its vertical offset follows the camera
+	def __init__(self, scale = 1):
+		self.width, self.height = WINDOW_WIDTH // scale, WINDOW_HEIGHT // scale
+		line = lambda size: max(1, size // scale) # keeps thin lines visible on a low resolution canvas
+
+		# the strip reaches a screen above and below the horizon, so one blit covers the screen
+		self.pad = line(24) # past this the horizon is off screen and a fill is enough
+		self.horizon_row = self.height + self.pad
+		self.line_top = line(3) // 2 # rows of the horizon line above the horizon
+		self.bands_top = line(20) # rows of the horizon bands above the horizon
+
+		surf = pygame.Surface((self.width, 2 * self.horizon_row))
+		if pygame.display.get_surface():
+			surf = surf.convert()
+		surf.fill(SKY_COLOR)
+		horizon = self.horizon_row
+		surf.fill(SEA_COLOR, (0, horizon, self.width, self.horizon_row))
+		surf.fill(HORIZON_TOP_COLOR, (0, horizon - line(10), self.width, line(10)))
+		surf.fill(HORIZON_TOP_COLOR, (0, horizon - line(16), self.width, line(4)))
+		surf.fill(HORIZON_TOP_COLOR, (0, horizon - self.bands_top, self.width, line(2)))
+		surf.fill(HORIZON_COLOR, (0, horizon - self.line_top, self.width, line(3)))
+		self.strip = surf
+
+	def draw(self, surface, horizon_y):
+		# horizon_y: screen row of the horizon
+		horizon_y = int(horizon_y)
+		if horizon_y < -self.pad:
+			surface.fill(SEA_COLOR)
+		elif horizon_y > self.height + self.pad:
+			surface.fill(SKY_COLOR)
+		else:
+			surface.blit(self.strip, (0, horizon_y - self.horizon_row))
+
+	def sky_rect(self, horizon_y, above_bands = False):
+		# screen area above the horizon line (editor clouds) or above the horizon bands (level clouds)
+		top = self.bands_top if above_bands else self.line_top
+		return pygame.Rect(0, 0, self.width, max(0, min(self.height, int(horizon_y) - top)))
+
+class CloudLayer:
+	# the clouds of one depth composited into a strip that wraps horizontally and scrolls at a fraction of the camera
+	def __init__(self, cloud_surfs, parallax, drift, count, band, large = False):
+		self.parallax = parallax # share of the camera movement
+		self.drift = drift # px / s of wind
+		self.scroll = 0
+
+		# cloud tops between band[0] and band[1] px above the horizon, spread evenly along the strip
+		surfs = [pygame.transform.scale2x(surf) for surf in cloud_surfs] if large else cloud_surfs
+		low, high = band
+		self.width = WINDOW_WIDTH
+		self.top = high # strip top above the horizon
+		strip = pygame.Surface((self.width, high - low + max(surf.get_height() for surf in surfs)))
+		if pygame.display.get_surface():
+			strip = strip.convert()
+		strip.fill(CLOUD_KEY)
+		slot = self.width // count
+		for index in range(count):
+			surf = choice(surfs)
+			x = index * slot + randint(0, slot)
+			y = randint(0, high - low)
+			strip.blit(surf, (x, y))
+			strip.blit(surf, (x - self.width, y)) # the part past the right edge wraps around
+
+		# the clouds only use fully opaque or fully clear pixels, so a run length encoded colorkey is exact and cheap
+		strip.set_colorkey(CLOUD_KEY, pygame.RLEACCEL)
+		self.strip = strip
+
+	def update(self, dt):
+		self.scroll = (self.scroll + self.drift * dt) % self.width
+
+	def draw(self, surface, camera_x, horizon_y, scale = 1):
+		# horizon_y in surface pixels, camera_x in world pixels
+		strip = self.strip if scale == 1 else scaled_image(self.strip, scale)
+		width = strip.get_width()
+		x = -(int((camera_x * self.parallax + self.scroll) / scale) % width)
+		y = int(horizon_y) - self.top // scale
+		surface.blit(strip, (x, y))
+		if x + width < surface.get_width():
+			surface.blit(strip, (x + width, y))
+
+def cloud_layers(cloud_surfs):
+	# far to near, see CLOUD_LAYERS
+	return [CloudLayer(cloud_surfs, **layer) for layer in CLOUD_LAYERS]
+
+backdrops = {}
+
+def get_backdrop(scale = 1):
+	# one strip per scale, shared by the level and the editor
+	if scale not in backdrops:
+		backdrops[scale] = Backdrop(scale)
+	return backdrops[scale]
@@ -0,0 +1,503 @@
+import os, json, argparse, tracemalloc
+import numpy as np
+from time import perf_counter
+
+# headless by default, a real window is not needed to measure
+os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+os.environ.setdefault('SDL_AUDIODRIVER', 'dummy')
+
+import pygame
+
+from settings import *
+from support import *
+
+def setup_display():
+	pygame.init()
+	pygame.display.set_mode((WINDOW_WIDTH, WINDOW_HEIGHT))
+
+def create_editor():
+	from editor import Editor
+	land_tiles = import_folder_dict('assets/graphics/terrain/land')
+	return Editor(land_tiles, lambda *args, **kwargs: None)
+
+def create_main():
+	from main import Main
+	return Main()
+
+class CountingSurface(pygame.Surface):
+	# offscreen target that counts the blit calls made from Python
+	def __init__(self, size):
+		super().__init__(size)
+		self.calls = 0
+
+	def blit(self, *args, **kwargs):
+		self.calls += 1
+		return super().blit(*args, **kwargs)
+
+	def blits(self, *args, **kwargs):
+		self.calls += 1
+		return super().blits(*args, **kwargs)
+
+def timed(function, *args, **kwargs):
+	start = perf_counter()
+	function(*args, **kwargs)
+	return perf_counter() - start
+
+# synthetic levels
+GROUND_ROW = 12 # top row of the ground strip in cells
+GROUND_DEPTH = 4 # rows of terrain under the surface
+ENEMY_MIX = (8, 9, 8, 10, 8, 23) # tooth, shell left, tooth, shell right, tooth, crabby
+COIN_MIX = (4, 5, 6) # gold, silver, diamond
+PALM_MIX = (11, 15, 12, 16, 13, 17, 14, 18) # fg and bg palms alternating
+
+def spread(count, width, row):
+	# count cells spread evenly over width columns of a row, further rows upward once it is full
+	return [(index % width if count > width else index * width // count, row - index // width) for index in range(count)]
+
+def synthetic_canvas(terrain, enemies, coins, water):
+	# cell -> CanvasTile: a ground strip, a pool right of it, enemies on the ground and coins above them
+	from editor import CanvasTile
+	width = max(8, -(-terrain // GROUND_DEPTH))
+	cells = [(col, GROUND_ROW + row) for col in range(width) for row in range(GROUND_DEPTH)][:terrain]
+	canvas_data = {cell: CanvasTile(2) for cell in cells}
+	pool = [(width + col, GROUND_ROW + row) for col in range(-(-water // GROUND_DEPTH)) for row in range(GROUND_DEPTH)][:water]
+	canvas_data.update((cell, CanvasTile(3)) for cell in pool)
+
+	def place(cell, tile_id):
+		if cell in canvas_data:
+			canvas_data[cell].add_id(tile_id)
+		else:
+			canvas_data[cell] = CanvasTile(tile_id)
+	for index, cell in enumerate(spread(enemies, width, GROUND_ROW - 1)):
+		place(cell, ENEMY_MIX[index % len(ENEMY_MIX)])
+	for index, cell in enumerate(spread(coins, width, GROUND_ROW - 3)):
+		place(cell, COIN_MIX[index % len(COIN_MIX)])
+	return canvas_data, width
+
+def synthetic_objects(palms, width):
+	# (tile_id, pos) in canvas pixels: the player, the sky handle and palms standing on the ground
+	objects = [(0, (TILE_SIZE, (GROUND_ROW - 2) * TILE_SIZE)), (1, (0, (GROUND_ROW - 1) * TILE_SIZE))]
+	for index, (col, _) in enumerate(spread(palms, width, 0)):
+		objects.append((PALM_MIX[index % len(PALM_MIX)], (col * TILE_SIZE + 10, GROUND_ROW * TILE_SIZE - 60)))
+	return objects
+
+def synthetic_grid(editor, terrain, enemies, coins, palms, water):
+	# a level in the format Main.load_level_grid returns, neighbor masks and water tops worked out by the editor
+	from editor import build_grid
+	canvas_data, width = synthetic_canvas(terrain, enemies, coins, water)
+	editor.canvas_data = canvas_data
+	editor.update_neighbors(list(canvas_data))
+	cells = editor.snapshot()[0]
+	return build_grid(cells, synthetic_objects(palms, width))
+
+# synthetic editor input, in the format of replay.py recordings
+def stroke(button, start, end, steps, mods = 0):
+	# press, move in steps, release, one frame each
+	from replay import frame_data
+	pressed = tuple(index == button - 1 for index in range(3))
+	frames = [frame_data([pygame.event.Event(pygame.MOUSEBUTTONDOWN, button = button, pos = start)], start, pressed, mods)]
+	for step in range(1, steps + 1):
+		pos = (start[0] + (end[0] - start[0]) * step // steps, start[1] + (end[1] - start[1]) * step // steps)
+		motion = pygame.event.Event(pygame.MOUSEMOTION, pos = pos, rel = (0, 0), buttons = pressed)
+		frames.append(frame_data([motion], pos, pressed, mods))
+	frames.append(frame_data([pygame.event.Event(pygame.MOUSEBUTTONUP, button = button, pos = end)], end, (False, False, False), mods))
+	return frames
+
+def key_press(key, mods = 0, pos = (640, 360)):
+	from replay import frame_data
+	return [frame_data([pygame.event.Event(pygame.KEYDOWN, key = key, mod = mods, unicode = '', scancode = 0)], pos, (False, False, False), mods)]
+
+def wheel(steps, mods = 0, pos = (640, 360)):
+	from replay import frame_data
+	return [frame_data([pygame.event.Event(pygame.MOUSEWHEEL, x = 0, y = -1, flipped = False)], pos, (False, False, False), mods) for _ in range(steps)]
+
+def editor_session():
+	# drag the player, paint and erase strokes, a rectangle, a save, pans and scrolling, then ENTER
+	return (
+		stroke(1, (200, 360), (600, 300), 60) # the player object, where the editor puts it
+		+ stroke(1, (100, 200), (1000, 500), 120) # terrain brush
+		+ stroke(3, (1000, 500), (100, 200), 120) # eraser
+		+ key_press(pygame.K_r) + stroke(1, (300, 100), (900, 400), 30) + key_press(pygame.K_b)
+		+ key_press(pygame.K_s, pygame.KMOD_LCTRL)
+		+ stroke(2, (640, 360), (140, 260), 120) # pan
+		+ wheel(60) + wheel(30, pygame.KMOD_LCTRL)
+		+ stroke(1, (400, 300), (800, 300), 60) # painting after the pan
+		+ key_press(pygame.K_RETURN)
+	)
+
+# benchmarks
+def bench_placement(args):
+	from editor import CanvasTile
+	editor = create_editor()
+	size = args.size
+	cells = [(col, row) for col in range(size) for row in range(size)]
+
+	# raw tile storage: add and remove every style
+	tile_ids = [2, 3, 4, 8, 20]
+	def add_remove():
+		for tile_id in tile_ids * (len(cells) // len(tile_ids)):
+			tile = CanvasTile(tile_id)
+			tile.add_id(2)
+			tile.remove_id(tile_id)
+	raw_time = timed(add_remove)
+
+	# brush: one cell and one neighbor update per mouse event
+	brush_time = timed(lambda: [editor.paint_cells([cell], 2) for cell in cells])
+	editor.history.commit(editor.cell_state)
+	undo_time = timed(lambda: editor.apply_history(editor.history.undo()))
+
+	# rectangle tool: one batch for the whole area
+	bounds = (0, 0, size - 1, size - 1)
+	rect_time = timed(editor.paint_cells, cells, 2, bounds = bounds)
+
+	return {
+		'cells': len(cells),
+		'tile add/remove per s': round(len(cells) * 2 / raw_time),
+		'brush cells per s': round(len(cells) / brush_time),
+		'rect fill ms': round(rect_time * 1000, 2),
+		'undo ms': round(undo_time * 1000, 2),
+	}
+
+def bench_memory(args):
+	from editor import CanvasTile
+	editor = create_editor()
+	count = args.cells
+	side = int(count ** 0.5) + 1
+	cells = [(col, row) for col in range(side) for row in range(side)][:count]
+
+	# a typical level mix: mostly terrain, some water, coins and enemies on top
+	tracemalloc.start()
+	start = tracemalloc.get_traced_memory()[0]
+	canvas_data = {}
+	for index, cell in enumerate(cells):
+		tile = CanvasTile(3 if index % 10 == 0 else 2)
+		if index % 7 == 0: tile.add_id(4)
+		if index % 31 == 0: tile.add_id(8)
+		canvas_data[cell] = tile
+	editor.canvas_data = canvas_data
+	editor.update_neighbors(cells)
+	used = tracemalloc.get_traced_memory()[0] - start
+	tracemalloc.stop()
+
+	return {
+		'cells': count,
+		'canvas MB': round(used / 2 ** 20, 2),
+		'bytes per cell': round(used / count, 1),
+	}
+
+def bench_effects(args):
+	from effects import Effects
+	from sprites import Particle
+	surface = pygame.display.get_surface()
+	frames = import_folder('assets/graphics/items/particle')
+	looping = frames * 1000 # long enough to outlive the measurement
+	positions = [(index * 7 % WINDOW_WIDTH, index * 13 % WINDOW_HEIGHT) for index in range(args.count)]
+	steps = 60
+
+	# one Particle sprite each, updated and blitted one by one
+	group = pygame.sprite.Group()
+	for pos in positions:
+		Particle(looping, pos, group)
+	def sprite_draw():
+		for sprite in group:
+			surface.blit(sprite.image, sprite.rect)
+	sprite_update = sum(timed(group.update, 1 / 60) for _ in range(steps))
+	sprite_draw = sum(timed(sprite_draw) for _ in range(steps))
+
+	# the same particles as arrays
+	effects = Effects()
+	for pos in positions:
+		effects.spawn_centered(looping, pos)
+	offset = pygame.math.Vector2()
+	effects_update = sum(timed(effects.update, 1 / 60) for _ in range(steps))
+	effects_draw = sum(timed(effects.draw, surface, offset) for _ in range(steps))
+
+	per_frame = lambda total: round(total / steps * 1000, 3)
+	return {
+		'particles': args.count,
+		'sprites update ms': per_frame(sprite_update),
+		'sprites draw ms': per_frame(sprite_draw),
+		'effects update ms': per_frame(effects_update),
+		'effects draw ms': per_frame(effects_draw),
+	}
+
+def bench_draw(args):
+	main = create_main()
+	main.switch(action = 'new_game')
+	level, editor = main.level, main.editor
+	for _ in range(10):
+		level.run(1 / 60)
+	level.inventory.visible = True
+	level.player.inventory = {'red_potion': 2, 'blue_potion': 3, 'key': 1}
+
+	# draw into a counting surface instead of the window
+	target = CountingSurface((WINDOW_WIDTH, WINDOW_HEIGHT))
+	level.display_surface = level.all_sprites.display_surface = level.inventory.display_surface = editor.display_surface = target
+	scenes = {
+		'camera': lambda: level.all_sprites.custom_draw(level.player),
+		'hud': level.draw_coin_hud,
+		'inventory': level.inventory.display,
+		'editor': editor.draw_level,
+		'editor sky': lambda: editor.display_sky(0),
+	}
+
+	steps = 60
+	def measure(draw):
+		draw() # warm up caches
+		target.calls = 0
+		draw_time = timed(lambda: [draw() for _ in range(steps)])
+		calls = target.calls
+
+		# memory held at once by the temporaries of one frame
+		tracemalloc.start()
+		start = tracemalloc.get_traced_memory()[0]
+		draw()
+		peak = tracemalloc.get_traced_memory()[1] - start
+		tracemalloc.stop()
+		return {
+			'draw calls per frame': calls // steps,
+			'ms per frame': round(draw_time / steps * 1000, 3),
+			'peak temporary KB': round(peak / 1024, 1),
+		}
+
+	results = {name: measure(draw) for name, draw in scenes.items()}
+
+	# the world on the low resolution canvas
+	level.all_sprites.set_scale(args.scale)
+	results[f'camera 1/{args.scale}'] = measure(scenes['camera'])
+	results['sprites'] = len(level.all_sprites)
+	return results
+
+def bench_present(args):
+	import render
+	main = create_main()
+	screen = pygame.display.get_surface()
+	full = WINDOW_WIDTH * WINDOW_HEIGHT
+	steps = 60
+
+	def present(scene, run):
+		# one frame of a scene plus its presentation, as in Main.run
+		run()
+		rects = getattr(scene, 'dirty_rects', None)
+		render.present(screen, rects)
+		if rects is None:
+			return full
+		return sum(rect.width * rect.height for rect in rects)
+
+	def measure(scene, run):
+		present(scene, run) # first frame draws everything
+		pixels = 0
+		start = perf_counter()
+		for _ in range(steps):
+			pixels += present(scene, run)
+		return {
+			'ms per frame': round((perf_counter() - start) / steps * 1000, 3),
+			'presented pixels per frame': pixels // steps,
+		}
+
+	main.switch(action = 'new_game')
+	level = main.level
+	level.run(1 / 60)
+	results = {'playing': measure(level, lambda: level.run(1 / 60))}
+	level.option_menu.active = True
+	results['paused'] = measure(level, lambda: level.run(1 / 60))
+	level.option_menu.active = False
+
+	main.switch(action = 'end_game')
+	end_menu = main.end_menu
+	results['end screen'] = measure(end_menu, end_menu.run)
+	return results
+
+def bench_backends(args):
+	import render
+	main = create_main()
+	main.switch(action = 'new_game')
+	level = main.level
+	for _ in range(10):
+		level.run(1 / 60)
+	level.inventory.visible = True
+
+	targets = {'software': pygame.display.get_surface()}
+	try:
+		targets['sdl2'] = render.TextureTarget((WINDOW_WIDTH, WINDOW_HEIGHT))
+	except (ImportError, RuntimeError) as error:
+		print(f'sdl2 backend skipped: {error}')
+
+	def frame(target):
+		# the level frame: world, HUD, inventory, minimap and pause button, then present
+		level.all_sprites.custom_draw(level.player)
+		level.draw_player_health_bar()
+		level.draw_coin_hud()
+		level.inventory.display()
+		level.draw_minimap()
+		level.option_menu.draw()
+		render.present(target)
+
+	results = {}
+	steps = 60
+	for name, target in targets.items():
+		level.display_surface = level.all_sprites.display_surface = level.inventory.display_surface = level.option_menu.display_surface = target
+		frame(target) # uploads textures once
+		results[name] = {
+			'ms per frame': round(timed(lambda: [frame(target) for _ in range(steps)]) / steps * 1000, 3),
+			'accelerated': getattr(target, 'accelerated', False),
+		}
+	return results
+
+def bench_profile(args):
+	# the level and the editor run frame by frame with every phase timed, as with F4 in the game
+	from profiler import profiler
+	main = create_main()
+	steps = args.frames
+	if not profiler.enabled:
+		profiler.toggle()
+
+	def record(run):
+		for _ in range(steps):
+			profiler.start_frame()
+			run(1 / 60)
+			profiler.end_frame()
+		return {name: {'avg ms': round(average, 3), 'p95 ms': round(p95, 3), 'p99 ms': round(p99, 3)}
+			for name, (average, p95, p99) in profiler.stats().items()}
+
+	main.switch(action = 'new_game')
+	results = {'level': record(main.level.run)}
+	profiler.frames.clear()
+	main.switch(action = 'editor')
+	results['editor'] = record(main.editor.run)
+	if args.csv:
+		profiler.dump_csv(args.csv)
+	return results
+
+def bench_level(args):
+	# a generated level built and run headless through Main, as in a new game
+	from profiler import profiler
+	main = create_main()
+	grid = synthetic_grid(main.editor, args.terrain, args.enemies, args.coins, args.palms, args.water)
+	main.level_grid = grid
+	build_time = timed(main.switch, action = 'new_game')
+	level = main.level
+
+	# update and draw split with the profiler sections of Level.run
+	if not profiler.enabled:
+		profiler.toggle()
+	for _ in range(args.frames):
+		profiler.start_frame()
+		level.run(1 / 60)
+		profiler.end_frame()
+	frames = list(profiler.recorded)
+	profiler.toggle()
+	per_frame = lambda names: round(sum(frame.get(name, 0) for frame in frames for name in names) / len(frames), 3)
+	update = ('update', 'player_attack', 'check_boss_defeat', 'get_coins', 'get_damage', 'tooth_attack_damage')
+
+	# Python allocations of a second build and a few frames, pixel buffers are not traced
+	main.switch(action = 'menu')
+	tracemalloc.start()
+	main.switch(action = 'new_game')
+	for _ in range(10):
+		main.level.run(1 / 60)
+	peak = tracemalloc.get_traced_memory()[1]
+	tracemalloc.stop()
+
+	return {
+		'grid': {name: len(layer) for name, layer in grid.items()},
+		'sprites': len(level.all_sprites),
+		'frames': args.frames,
+		'build ms': round(build_time * 1000, 2),
+		'update ms per frame': per_frame(update),
+		'draw ms per frame': per_frame(('custom_draw', 'hud')),
+		'frame ms': per_frame(('frame',)),
+		'peak MB': round(peak / 2 ** 20, 2),
+	}
+
+def bench_editor(args):
+	# editor input replayed headless at full speed on a large canvas, per frame cost of the hot paths
+	import editor as editor_module
+	from editor import Editor
+	from profiler import profiler
+	from replay import Replay
+
+	land_tiles = import_folder_dict('assets/graphics/terrain/land')
+	grid = synthetic_grid(create_editor(), args.terrain, args.enemies, args.coins, args.palms, args.water)
+	build_time = timed(lambda: Editor(land_tiles, lambda *args, **kwargs: None, grid))
+	editor = Editor(land_tiles, lambda *args, **kwargs: None, grid)
+	editor.save_level_data = lambda grid: True # saves run, the level on disk is left alone
+
+	# methods called from the event handlers are timed into the profiler like the sections of Editor.run
+	calls = dict.fromkeys(('check_neighbors', 'update_neighbors', 'create_grid'), 0)
+	def timed_method(name):
+		method = getattr(editor, name)
+		def timed_call(*args, **kwargs):
+			calls[name] += 1
+			start = perf_counter()
+			result = method(*args, **kwargs)
+			profiler.add(name, perf_counter() - start)
+			return result
+		setattr(editor, name, timed_call)
+	for name in calls:
+		timed_method(name)
+
+	replay = Replay.load(args.replay) if args.replay else Replay(editor_session())
+	if not profiler.enabled:
+		profiler.toggle()
+	start = perf_counter()
+	with replay.playing(editor_module):
+		while replay.next_frame():
+			profiler.start_frame()
+			editor.run(1 / 60)
+			profiler.end_frame()
+	total = perf_counter() - start
+	if editor.save_thread:
+		editor.save_thread.join()
+
+	# every replayed frame, not only the profiler window
+	frames = profiler.recorded
+	results = {
+		'cells': len(editor.canvas_data),
+		'frames': len(frames),
+		'build ms': round(build_time * 1000, 2),
+		'frames per s': round(len(frames) / total),
+	}
+	for name in ('frame', 'check_neighbors', 'update_neighbors', 'draw_level', 'draw_tile_lines', 'create_grid'):
+		times = np.array([frame.get(name, 0) for frame in frames])
+		results[name] = {
+			'calls': calls.get(name, len(frames)),
+			'ms per frame': round(times.mean(), 3),
+			'p95 ms': round(np.percentile(times, 95), 3),
+			'p99 ms': round(np.percentile(times, 99), 3),
+			'max ms': round(times.max(), 3),
+		}
+	profiler.toggle()
+	return results
+
+BENCHMARKS = {
+	'placement': bench_placement,
+	'memory': bench_memory,
+	'effects': bench_effects,
+	'draw': bench_draw,
+	'present': bench_present,
+	'backends': bench_backends,
+	'profile': bench_profile,
+	'level': bench_level,
+	'editor': bench_editor,
+}
+
+if __name__ == '__main__':
+	parser = argparse.ArgumentParser(description = 'Treasure Hunter benchmarks')
+	parser.add_argument('benchmark', choices = BENCHMARKS)
+	parser.add_argument('--size', type = int, default = 100, help = 'side of the painted square in cells')
+	parser.add_argument('--cells', type = int, default = 100000, help = 'canvas size for the memory benchmark')
+	parser.add_argument('--count', type = int, default = 2000, help = 'number of particles for the effects benchmark')
+	parser.add_argument('--scale', type = int, default = 2, help = 'render scale compared in the draw benchmark')
+	parser.add_argument('--frames', type = int, default = PROFILER_FRAMES, help = 'frames per scene for the profile and level benchmarks')
+	parser.add_argument('--terrain', type = int, default = 4000, help = 'level and editor benchmarks: terrain cells')
+	parser.add_argument('--enemies', type = int, default = 60, help = 'level and editor benchmarks: tooth, shell and crabby enemies')
+	parser.add_argument('--coins', type = int, default = 400, help = 'level and editor benchmarks: coins')
+	parser.add_argument('--palms', type = int, default = 120, help = 'level and editor benchmarks: palms')
+	parser.add_argument('--water', type = int, default = 400, help = 'level and editor benchmarks: water cells')
+	parser.add_argument('--replay', help = 'editor benchmark: a session recorded with replay.py instead of the built-in one')
+	parser.add_argument('--csv', help = 'profile benchmark: write every frame to this CSV file')
+	args = parser.parse_args()
+
+	setup_display()
+	print(json.dumps(BENCHMARKS[args.benchmark](args), indent = 4))
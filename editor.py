@@ -1,14 +1,20 @@
-import pygame, sys, os, json 
+import pygame, sys, os, json, threading
+from collections import OrderedDict
 from pygame.math import Vector2 as vector
 from pygame.mouse import get_pressed as mouse_buttons
 from pygame.mouse import get_pos as mouse_pos
+from pygame.key import get_mods as key_mods
 from pygame.image import load
 
-from random import choice, randint
-
 from settings import *
 from support import *
 from editor_menu import EditorMenu
+from history import History
+from spatial import SpatialHash
+from minimap import Minimap, cell_color
+from backdrop import get_backdrop, cloud_layers
+from profiler import profiler, startup
+from tile_registry import *
 from timer import Timer
 
 
@@ -22,20 +28,28 @@ class Editor:
 
 		# imports 
 		self.land_tiles = land_tiles
-		self.imports()
+		self.land_lookup = land_lookup(land_tiles)
+		with startup.phase('Editor.imports'):
+			self.imports()
 
-		# clouds
-		self.current_clouds = []
-		self.cloud_surf = import_folder('assets/graphics/clouds')
-		self.cloud_timer = pygame.USEREVENT + 1
-		pygame.time.set_timer(self.cloud_timer, 2000)
-		self.startup_clouds()
+		# parallax clouds
+		self.clouds = cloud_layers(import_folder('assets/graphics/clouds'))
 
 		# navigation
 		self.origin = vector()
 		self.pan_active = False
 		self.pan_offset = vector()
 
+		# chunk cache (static terrain per CHUNK_SIZE x CHUNK_SIZE cells), least recently drawn first
+		self.chunk_surfs = OrderedDict() # chunk -> (surf, offset) or None when it has no static content
+		self.chunk_view = None # chunk range of the last draw_level
+		self.chunk_limit = 0
+		self.chunk_versions = {} # bumped on every change, play-tests rebuild only changed chunks
+		self.grid_offset = (0, 0) # top left cell of the last play-test grid
+
+		# minimap, repainted only where cells change
+		self.minimap = Minimap((WINDOW_WIDTH - 10, 10))
+
 		# support lines 
 		self.support_line_surf = pygame.Surface((WINDOW_WIDTH, WINDOW_HEIGHT))
 		self.support_line_surf.set_colorkey('green')
@@ -45,21 +59,37 @@ class Editor:
 		self.selection_index = 2
 		self.last_selected_cell = None
 
+		# tools
+		self.tool = 'brush'
+		self.tool_start = None # cell where a rect / copy drag started
+		self.clipboard = {} # relative cell -> state
+
 		# menu 
 		self.menu = EditorMenu()
 
 		# objects
-		self.canvas_objects = pygame.sprite.Group()
+		self.canvas_objects = ObjectIndex()
 		self.foreground = pygame.sprite.Group()
 		self.background = pygame.sprite.Group()
 		self.object_drag_active = False
+		self.drag_object = None
 		self.object_timer = Timer(400)
 
+		# undo / redo
+		self.history = History(UNDO_LIMIT)
+
+		# saving
+		self.dirty = False # canvas changed since the last save
+		self.save_thread = None
+		self.autosave_timer = pygame.USEREVENT + 3
+		pygame.time.set_timer(self.autosave_timer, AUTOSAVE_INTERVAL)
+
 		if level_grid:
-			self.load_from_grid(level_grid)
+			with startup.phase('Editor.load_from_grid'):
+				self.load_from_grid(level_grid)
 		else:
 			# Player
-			CanvasObject(
+			self.player_object = CanvasObject(
 				pos = (200, WINDOW_HEIGHT / 2), 
 				frames = self.animations[0]['frames'],
 				tile_id =  0, 
@@ -75,7 +105,8 @@ class Editor:
 				group = [self.canvas_objects, self.background])
 
 		# music
-		self.editor_music = pygame.mixer.Sound('assets/audio/Explorer.ogg')
+		with startup.phase('assets/audio'):
+			self.editor_music = pygame.mixer.Sound('assets/audio/Explorer.ogg')
 		self.editor_music.set_volume(0.4)
 		# Note: Music starts in Main.switch(grid=None)
 
@@ -122,7 +153,7 @@ class Editor:
 		for layer_name in ('fg objects', 'bg palms'):
 			if layer_name in grid:
 				for pos, tile_id in grid[layer_name].items():
-					groups = [self.canvas_objects, self.background] if EDITOR_DATA[tile_id]['style'] == 'palm_bg' else [self.canvas_objects, self.foreground]
+					groups = self.object_groups(tile_id)
 					
 					# Determine which frames to use based on the object's ID
 					if tile_id == 1: # Special case for the sky handle
@@ -140,10 +171,11 @@ class Editor:
 					
 					if tile_id == 1:
 						self.sky_handle = obj
+					if tile_id == 0:
+						self.player_object = obj
 
 		# 3. Re-run the neighbor check on all tiles to correctly draw the autotiles
-		for cell in self.canvas_data:
-			self.check_neighbors(cell)
+		self.update_neighbors(self.canvas_data)
    
 	# support
  
@@ -163,28 +195,61 @@ class Editor:
 		return col, row
 
 	def check_neighbors(self, cell_pos):
-		cluster_size = 3
-		local_cluster = [
-			(cell_pos[0] + col - int(cluster_size / 2), cell_pos[1] + row - int(cluster_size / 2)) 
-			for col in range(cluster_size) 
-			for row in range(cluster_size)]
+		self.update_neighbors([cell_pos])
 
-		# check neighbors
-		for cell in local_cluster:
-			if cell in self.canvas_data:
-				self.canvas_data[cell].terrain_neighbors = []
-				self.canvas_data[cell].water_on_top = False
-				for name, side in NEIGHBOR_DIRECTIONS.items():
-					neighbor_cell = (cell[0] + side[0],cell[1] + side[1])
+	def update_neighbors(self, cells, bounds = None):
+		# every changed cell plus a one cell border, each updated once
+		if bounds: # (left, top, right, bottom) of a batch
+			left, top, right, bottom = bounds
+			affected = [(col, row) for col in range(left - 1, right + 2) for row in range(top - 1, bottom + 2)]
+		else:
+			affected = {(x + col, y + row) for x, y in cells for col in (-1, 0, 1) for row in (-1, 0, 1)}
 
-					if neighbor_cell in self.canvas_data:
+		self.minimap.paint((cell, self.minimap_color(cell)) for cell in cells)
+
+		for chunk in {self.get_chunk(cell) for cell in affected}:
+			self.chunk_surfs.pop(chunk, None)
+			self.chunk_versions[chunk] = self.chunk_versions.get(chunk, 0) + 1
+
+		# check neighbors
+		get_tile = self.canvas_data.get
+		directions = tuple((NEIGHBOR_BITS[name], side) for name, side in NEIGHBOR_DIRECTIONS.items())
+		top_bit = NEIGHBOR_BITS['A']
+		water_on_top_flag = CanvasTile.WATER_ON_TOP
+		for cell in affected:
+			tile = get_tile(cell)
+			if not tile:
+				continue
+
+			mask = 0
+			flags = tile.flags & ~water_on_top_flag
+			for bit, side in directions:
+				neighbor = get_tile((cell[0] + side[0], cell[1] + side[1]))
+				if neighbor:
 					# water top neighbor
-						if self.canvas_data[neighbor_cell].has_water and self.canvas_data[cell].has_water and name == 'A':
-							self.canvas_data[cell].water_on_top = True
+					if bit == top_bit and neighbor.flags & CanvasTile.WATER and flags & CanvasTile.WATER:
+						flags |= water_on_top_flag
 
 					# terrain neighbors
-						if self.canvas_data[neighbor_cell].has_terrain:
-							self.canvas_data[cell].terrain_neighbors.append(name)
+					if neighbor.flags & CanvasTile.TERRAIN:
+						mask |= bit
+
+			tile.neighbor_mask = mask
+			tile.flags = flags
+
+	def minimap_color(self, cell):
+		tile = self.canvas_data.get(cell)
+		return cell_color(*tile.get_state()) if tile else None
+
+	def get_chunk(self, cell_pos):
+		return cell_pos[0] // CHUNK_SIZE, cell_pos[1] // CHUNK_SIZE
+
+	def visible_cells(self, margin = 0):
+		left = int((-self.origin.x) // TILE_SIZE) - margin
+		top = int((-self.origin.y) // TILE_SIZE) - margin
+		right = int((WINDOW_WIDTH - self.origin.x) // TILE_SIZE) + margin
+		bottom = int((WINDOW_HEIGHT - self.origin.y) // TILE_SIZE) + margin
+		return left, top, right, bottom
 
 	def imports(self):
 		self.water_bottom = load('assets/graphics/terrain/water/water_bottom.png').convert_alpha()
@@ -202,7 +267,7 @@ class Editor:
 				}
 
 		# preview
-		self.preview_surfs = {key: load(value['preview']) for key, value in EDITOR_DATA.items() if value['preview']}
+		self.preview_surfs = preview_surfaces()
 
 	def animation_update(self, dt):
 		for value in self.animations.values():
@@ -210,73 +275,33 @@ class Editor:
 			if value['frame index'] >= value['length']:
 				value['frame index'] = 0
 
-	def mouse_on_object(self):
-		for sprite in self.canvas_objects:
-			if sprite.rect.collidepoint(mouse_pos()):
-				return sprite
+	def object_groups(self, tile_id):
+		return [self.canvas_objects, self.background] if tile_id in PALM_BG_IDS else [self.canvas_objects, self.foreground]
 
-	def create_grid(self):
-		for tile in self.canvas_data.values():
-			tile.objects = []
-
-		for obj in self.canvas_objects:
-			current_cell = self.get_current_cell(obj)
-			offset = vector(obj.distance_to_origin) - (vector(current_cell) * TILE_SIZE)
-
-			if current_cell in self.canvas_data: # tile exists already
-				self.canvas_data[current_cell].add_id(obj.tile_id, offset)
-			else: # no tile exists yet 
-				self.canvas_data[current_cell] = CanvasTile(obj.tile_id, offset)
-
-		# create an empty grid
-		layers = {
-			'water': {},
-			'bg palms': {},
-			'terrain': {}, 
-			'enemies': {},
-			'coins': {}, 
-			'fg objects': {},
-			'items': {},
-		}
-
-		# grid offset 
-		if not self.canvas_data:
-			return layers
-			
-		left = sorted(self.canvas_data.keys(), key = lambda tile: tile[0])[0][0]
-		top = sorted(self.canvas_data.keys(), key = lambda tile: tile[1])[0][1]
+	def mouse_on_object(self, pos = None):
+		world_pos = vector(pos or mouse_pos()) - self.origin
+		return self.canvas_objects.at(world_pos)
 
-		# fill the grid
-		for tile_pos, tile in self.canvas_data.items():
-			row_adjusted = tile_pos[1] - top
-			col_adjusted = tile_pos[0] - left
-			x = col_adjusted * TILE_SIZE
-			y = row_adjusted * TILE_SIZE
+	def play_test(self):
+		# play the canvas as it is, without saving or going through the menu
+		cells, objects = self.snapshot()
+		self.grid_offset = grid_offset(cells, objects)
+		self.switch(grid = build_grid(cells, objects), action = 'playtest')
 
-			if tile.has_water:
-				layers['water'][(x,y)] = tile.get_water()
+	def chunk_key(self, pos):
+		# play-test grid position -> editor chunk and its version
+		cell = (pos[0] // TILE_SIZE + self.grid_offset[0], pos[1] // TILE_SIZE + self.grid_offset[1])
+		chunk = self.get_chunk(cell)
+		return chunk, self.chunk_versions.get(chunk, 0), self.grid_offset
 
-			if tile.has_terrain:
-				terrain_string = tile.get_terrain()
-				layers['terrain'][(x,y)] = terrain_string if terrain_string in self.land_tiles else 'X'
-
-			if tile.coin:
-				layers['coins'][(x + TILE_SIZE // 2,y + TILE_SIZE // 2)] = tile.coin
-
-			if tile.enemy:
-				layers['enemies'][(x,y)] = tile.enemy
-    
-			if tile.item:
-				layers['items'][(x, y)] = tile.item
+	def create_grid(self):
+		return build_grid(*self.snapshot())
 
-			if tile.objects: # (obj, offset)
-				for obj, offset in tile.objects:
-					if obj in [key for key, value in EDITOR_DATA.items() if value['style'] == 'palm_bg']: # bg palm
-						layers['bg palms'][(int(x + offset.x), int(y + offset.y))] = obj
-					else: # fg objects
-						layers['fg objects'][(int(x + offset.x), int(y + offset.y))] = obj
-
-		return layers
+	def snapshot(self):
+		# plain tuples, safe to hand to the save thread
+		cells = [(cell, tile.get_state(), tile.neighbor_mask, tile.water_on_top) for cell, tile in self.canvas_data.items()]
+		objects = [(obj.tile_id, (obj.distance_to_origin.x, obj.distance_to_origin.y)) for obj in self.canvas_objects]
+		return cells, objects
 
 	def save_level_data(self, grid_data):
 		# Convert tuple keys to string keys for JSON saving.
@@ -289,40 +314,88 @@ class Editor:
 		filename = "saved_level_grid.json"
 		os.makedirs("data", exist_ok=True)
 		save_path = os.path.join("data", filename)
+		temp_path = save_path + '.tmp'
 		
 		try:
-			with open(save_path, 'w') as f:
+			# write aside and swap, a crash mid-write never leaves a broken level
+			with open(temp_path, 'w') as f:
 				json.dump(serializable_grid, f, indent=4)
+			os.replace(temp_path, save_path)
 			print(f"✅ Level grid saved to {save_path}")
+			return True
 		except Exception as e:
 			print(f"Error saving level: {e}")
+			return False
+
+	def save_snapshot(self, snapshot):
+		if not self.save_level_data(build_grid(*snapshot)):
+			self.dirty = True
+
+	def save_in_background(self, grid = None):
+		if self.save_thread and self.save_thread.is_alive():
+			if grid is None: # autosave, try again on the next tick
+				return
+			self.save_thread.join()
+
+		self.dirty = False
+		if grid is None:
+			self.save_thread = threading.Thread(target = self.save_snapshot, args = (self.snapshot(),))
+		else:
+			self.save_thread = threading.Thread(target = self.save_level_data, args = (grid,))
+		self.save_thread.start()
 
 	# input
 	def event_loop(self):
 		for event in pygame.event.get():
 			if event.type == pygame.QUIT:
+				if self.save_thread:
+					self.save_thread.join()
 				pygame.quit()
 				sys.exit()
+
+			profiler.handle_event(event)
 			
 			if event.type == pygame.KEYDOWN and event.key == pygame.K_RETURN:
 				# 1. Create the grid from the current canvas objects
 				grid = self.create_grid()
-				# 2. Save the grid persistently
-				self.save_level_data(grid)
+				# 2. Save the grid persistently (written on a worker thread)
+				self.save_in_background(grid)
 				# 3. Switch back to the Menu, carrying the grid data
 				self.switch(grid=grid, action='menu') 
 				self.editor_music.stop()
 
+			# save without leaving the editor
+			if event.type == pygame.KEYDOWN and event.key == pygame.K_s and event.mod & pygame.KMOD_CTRL:
+				self.save_in_background()
+
+			if event.type == pygame.KEYDOWN and event.key == pygame.K_m:
+				self.minimap.toggle()
+
+			if event.type == pygame.KEYDOWN and event.key == pygame.K_p and not self.history.stroke:
+				self.play_test()
+				return
+
+			if event.type == self.autosave_timer and self.dirty:
+				self.save_in_background()
+
 			self.pan_input(event)
 			self.selection_hotkeys(event)
 			self.menu_click(event)
 
+			self.history_hotkeys(event)
+			self.tool_hotkeys(event)
+			self.tool_input(event)
+
 			self.object_drag(event)
 			
 			self.canvas_add()
 			self.canvas_remove()
 
-			self.create_clouds(event)
+			# a finished stroke becomes one undo step
+			if event.type == pygame.MOUSEBUTTONUP:
+				if self.history.commit(self.cell_state):
+					self.dirty = True
+				self.last_selected_cell = None
 
 	def pan_input(self, event): 
 		# middle mouse button pressed / released 
@@ -335,20 +408,15 @@ class Editor:
 
 		# mouse wheel 
 		if event.type == pygame.MOUSEWHEEL:
-			if pygame.key.get_pressed()[pygame.K_LCTRL]:
+			if key_mods() & pygame.KMOD_CTRL:
 				self.origin.y -= event.y * 50
 			else:
 				self.origin.x -= event.y * 50
-			for sprite in self.canvas_objects:
-				sprite.pan_pos(self.origin)
 
-		# panning update
+		# panning update (objects live in world space, only the origin moves)
 		if self.pan_active:
 			self.origin = vector(mouse_pos()) - self.pan_offset
 
-			for sprite in self.canvas_objects:
-				sprite.pan_pos(self.origin)
-
 	def selection_hotkeys(self, event):
 		if event.type == pygame.KEYDOWN:
 			if event.key == pygame.K_RIGHT:
@@ -363,11 +431,14 @@ class Editor:
 			self.selection_index = new_index if new_index else self.selection_index
 
 	def canvas_add(self):
+		if self.tool != 'brush':
+			return
 		if mouse_buttons()[0] and not self.menu.rect.collidepoint(mouse_pos()) and not self.object_drag_active:
 			current_cell = self.get_current_cell()
-			if EDITOR_DATA[self.selection_index]['type'] == 'tile':
+			if TILE_TYPES[self.selection_index] == 'tile':
 
 				if current_cell != self.last_selected_cell:
+					self.history.record_cell(current_cell, self.cell_state(current_cell))
 
 					if current_cell in self.canvas_data:
 						self.canvas_data[current_cell].add_id(self.selection_index)
@@ -378,28 +449,32 @@ class Editor:
 					self.last_selected_cell = current_cell
 			else: # object
 				if not self.object_timer.active:
-					groups = [self.canvas_objects, self.background] if EDITOR_DATA[self.selection_index]['style'] == 'palm_bg' else [self.canvas_objects, self.foreground]
-					CanvasObject(
+					obj = CanvasObject(
 						pos = mouse_pos(),
 						frames = self.animations[self.selection_index]['frames'],
 						tile_id = self.selection_index,
 						origin = self.origin,
-						group = groups)
+						group = self.object_groups(self.selection_index))
+					self.history.record_object(obj, None)
 					self.object_timer.activate()
 
 	def canvas_remove(self):
+		if self.tool != 'brush':
+			return
 		if mouse_buttons()[2] and not self.menu.rect.collidepoint(mouse_pos()):
 
 			# delete object
 			selected_object = self.mouse_on_object()
 			if selected_object:
-				if EDITOR_DATA[selected_object.tile_id]['style'] not in ('player', 'sky'):
+				if TILE_STYLES[selected_object.tile_id] not in ('player', 'sky'):
+					self.history.record_object(selected_object, selected_object.distance_to_origin)
 					selected_object.kill()
 
 			# delete tiles
 			if self.canvas_data:
 				current_cell = self.get_current_cell()
 				if current_cell in self.canvas_data:
+					self.history.record_cell(current_cell, self.cell_state(current_cell))
 					self.canvas_data[current_cell].remove_id(self.selection_index)
 
 					if self.canvas_data[current_cell].is_empty:
@@ -407,17 +482,155 @@ class Editor:
 					self.check_neighbors(current_cell)
 
 	def object_drag(self, event):
-		if event.type == pygame.MOUSEBUTTONDOWN and mouse_buttons()[0]:
-			for sprite in self.canvas_objects:
-				if sprite.rect.collidepoint(event.pos):
-					sprite.start_drag()
-					self.object_drag_active = True
+		if event.type == pygame.MOUSEBUTTONDOWN and mouse_buttons()[0] and self.tool == 'brush':
+			sprite = self.mouse_on_object(event.pos)
+			if sprite:
+				self.history.record_object(sprite, sprite.distance_to_origin)
+				sprite.start_drag(self.origin)
+				self.drag_object = sprite
+				self.object_drag_active = True
 
 		if event.type == pygame.MOUSEBUTTONUP and self.object_drag_active:
-			for sprite in self.canvas_objects:
-				if sprite.selected:
-					sprite.drag_end(self.origin)
-					self.object_drag_active = False
+			self.drag_object.drag_end()
+			self.canvas_objects.move(self.drag_object)
+			self.drag_object = None
+			self.object_drag_active = False
+
+	# tools
+	def tool_hotkeys(self, event):
+		tools = {pygame.K_b: 'brush', pygame.K_r: 'rect', pygame.K_f: 'fill', pygame.K_c: 'copy', pygame.K_v: 'stamp'}
+		if event.type == pygame.KEYDOWN and event.key in tools and not event.mod & pygame.KMOD_CTRL:
+			self.tool = tools[event.key]
+			self.tool_start = None
+
+	def tool_input(self, event):
+		if self.tool == 'brush':
+			return
+
+		if event.type == pygame.MOUSEBUTTONDOWN and event.button in (1, 3) and not self.menu.rect.collidepoint(mouse_pos()):
+			current_cell = self.get_current_cell()
+			if self.tool in ('rect', 'copy'):
+				self.tool_start = current_cell
+
+			elif self.tool == 'fill' and event.button == 1 and TILE_TYPES[self.selection_index] == 'tile':
+				region = self.flood_region(current_cell)
+				if region:
+					self.paint_cells(region, self.selection_index, bounds = self.cell_bounds(region))
+				else:
+					print(f"Fill area is open or larger than {FILL_LIMIT} cells.")
+
+			elif self.tool == 'stamp' and event.button == 1 and self.clipboard:
+				self.stamp(current_cell)
+
+		if event.type == pygame.MOUSEBUTTONUP and event.button in (1, 3) and self.tool_start:
+			bounds = self.cell_bounds([self.tool_start, self.get_current_cell()])
+			left, top, right, bottom = bounds
+			cells = [(col, row) for col in range(left, right + 1) for row in range(top, bottom + 1)]
+
+			if self.tool == 'rect' and TILE_TYPES[self.selection_index] == 'tile':
+				self.paint_cells(cells, self.selection_index, remove = event.button == 3, bounds = bounds)
+			elif self.tool == 'copy':
+				self.clipboard = {(col - left, row - top): self.canvas_data[(col, row)].get_state() for col, row in cells if (col, row) in self.canvas_data}
+			self.tool_start = None
+
+	def cell_bounds(self, cells):
+		cols = [cell[0] for cell in cells]
+		rows = [cell[1] for cell in cells]
+		return min(cols), min(rows), max(cols), max(rows)
+
+	def paint_cells(self, cells, tile_id, remove = False, bounds = None):
+		for cell in cells:
+			self.history.record_cell(cell, self.cell_state(cell))
+			tile = self.canvas_data.get(cell)
+			if remove:
+				if tile:
+					tile.remove_id(tile_id)
+					if tile.is_empty:
+						del self.canvas_data[cell]
+			elif tile:
+				tile.add_id(tile_id)
+			else:
+				self.canvas_data[cell] = CanvasTile(tile_id)
+		self.update_neighbors(cells, bounds)
+
+	def flood_region(self, start_cell):
+		# 4-connected cells with the same content as the start cell
+		target = self.cell_state(start_cell)
+		region = {start_cell}
+		stack = [start_cell]
+		while stack:
+			col, row = stack.pop()
+			for cell in ((col + 1, row), (col - 1, row), (col, row + 1), (col, row - 1)):
+				if cell not in region and self.cell_state(cell) == target:
+					region.add(cell)
+					stack.append(cell)
+					if len(region) > FILL_LIMIT:
+						return None
+		return region
+
+	def stamp(self, topleft):
+		cells = []
+		for (col, row), state in self.clipboard.items():
+			cell = (topleft[0] + col, topleft[1] + row)
+			self.history.record_cell(cell, self.cell_state(cell))
+			if cell in self.canvas_data:
+				self.canvas_data[cell].set_state(state)
+			else:
+				self.canvas_data[cell] = CanvasTile.from_state(state)
+			cells.append(cell)
+		self.update_neighbors(cells, self.cell_bounds(cells))
+
+	def tool_preview(self):
+		if self.tool in ('rect', 'copy') and self.tool_start:
+			left, top, right, bottom = self.cell_bounds([self.tool_start, self.get_current_cell()])
+		elif self.tool == 'stamp' and self.clipboard and not self.menu.rect.collidepoint(mouse_pos()):
+			col, row = self.get_current_cell()
+			width, height = self.cell_bounds(self.clipboard)[2:]
+			left, top, right, bottom = col, row, col + width, row + height
+		else:
+			return
+
+		rect = pygame.Rect(
+			self.origin + vector(left, top) * TILE_SIZE,
+			((right - left + 1) * TILE_SIZE, (bottom - top + 1) * TILE_SIZE))
+		pygame.draw.rect(self.display_surface, BUTTON_LINE_COLOR, rect, 3)
+
+	# history
+	def cell_state(self, cell):
+		tile = self.canvas_data.get(cell)
+		return tile.get_state() if tile else None
+
+	def history_hotkeys(self, event):
+		if event.type == pygame.KEYDOWN and event.mod & pygame.KMOD_CTRL:
+			if event.key == pygame.K_y or (event.key == pygame.K_z and event.mod & pygame.KMOD_SHIFT):
+				self.apply_history(self.history.redo())
+			elif event.key == pygame.K_z:
+				self.apply_history(self.history.undo())
+
+	def apply_history(self, changes):
+		if not changes:
+			return
+		cells, objects = changes
+		self.dirty = True
+
+		for cell, state in cells.items():
+			if state is None:
+				self.canvas_data.pop(cell, None)
+			elif cell in self.canvas_data:
+				self.canvas_data[cell].set_state(state)
+			else:
+				self.canvas_data[cell] = CanvasTile.from_state(state)
+		self.update_neighbors(cells)
+
+		for obj, pos in objects.items():
+			if pos is None:
+				obj.kill()
+			else:
+				obj.set_pos(pos)
+				if obj.alive():
+					self.canvas_objects.move(obj)
+				else:
+					obj.add(self.object_groups(obj.tile_id))
 
 	# drawing 
 	def draw_tile_lines(self):
@@ -440,60 +653,135 @@ class Editor:
 
 		self.display_surface.blit(self.support_line_surf,(0,0))
 
+	def render_chunk(self, chunk):
+		# static content only: terrain and the still water below the surface
+		# the surface only covers the filled cells, a ground strip costs a few rows instead of the whole chunk
+		left, top = chunk[0] * CHUNK_SIZE, chunk[1] * CHUNK_SIZE
+		cells = []
+		for col in range(left, left + CHUNK_SIZE):
+			for row in range(top, top + CHUNK_SIZE):
+				tile = self.canvas_data.get((col, row))
+				if tile and (tile.has_terrain or (tile.has_water and tile.water_on_top)):
+					cells.append((col, row, tile))
+
+		chunk_surf = None
+		if cells:
+			min_col = min(col for col, row, tile in cells)
+			min_row = min(row for col, row, tile in cells)
+			max_col = max(col for col, row, tile in cells)
+			max_row = max(row for col, row, tile in cells)
+			surf = pygame.Surface(((max_col - min_col + 1) * TILE_SIZE, (max_row - min_row + 1) * TILE_SIZE), pygame.SRCALPHA)
+			for col, row, tile in cells:
+				pos = ((col - min_col) * TILE_SIZE, (row - min_row) * TILE_SIZE)
+
+				if tile.has_water and tile.water_on_top:
+					surf.blit(self.water_bottom, pos)
+
+				if tile.has_terrain:
+					surf.blit(self.land_lookup[tile.neighbor_mask], pos)
+			chunk_surf = surf, ((min_col - left) * TILE_SIZE, (min_row - top) * TILE_SIZE)
+
+		self.chunk_surfs[chunk] = chunk_surf
+		while len(self.chunk_surfs) > self.chunk_limit:
+			self.chunk_surfs.popitem(last = False)
+		return chunk_surf
+
+	def evict_chunks(self):
+		# drops the cached chunks outside the view plus CHUNK_MARGIN, the cache never holds more than that range
+		left, top, right, bottom = self.visible_cells(margin = CHUNK_MARGIN * CHUNK_SIZE)
+		keep_left, keep_top = self.get_chunk((left, top))
+		keep_right, keep_bottom = self.get_chunk((right, bottom))
+		self.chunk_limit = (keep_right - keep_left + 1) * (keep_bottom - keep_top + 1)
+		for chunk in [chunk for chunk in self.chunk_surfs if not (keep_left <= chunk[0] <= keep_right and keep_top <= chunk[1] <= keep_bottom)]:
+			del self.chunk_surfs[chunk]
+
+	def object_blits(self, group):
+		view_rect = pygame.Rect(-self.origin, (WINDOW_WIDTH, WINDOW_HEIGHT))
+		visible = [sprite for sprite in self.canvas_objects.in_rect(view_rect) if sprite in group]
+		origin_x, origin_y = self.origin
+		return [(sprite.image, (origin_x + sprite.rect.x, origin_y + sprite.rect.y)) for sprite in sorted(visible, key = lambda sprite: sprite.order)]
+
+	def draw_objects(self, group):
+		self.display_surface.blits(self.object_blits(group), doreturn = False)
+
 	def draw_level(self):
-		self.background.draw(self.display_surface)
-		for cell_pos, tile in self.canvas_data.items():
-			pos = self.origin + vector(cell_pos) * TILE_SIZE
-
-			# water
-			if tile.has_water:
-				if tile.water_on_top:
-					self.display_surface.blit(self.water_bottom, pos)
+		# everything goes out in one blits call: background objects, chunks, animated tiles, foreground objects
+		blits = self.object_blits(self.background)
+		origin_x, origin_y = self.origin
+
+		# cached static chunks
+		chunk_pixels = CHUNK_SIZE * TILE_SIZE
+		left, top, right, bottom = self.visible_cells()
+		chunk_left, chunk_top = self.get_chunk((left, top))
+		chunk_right, chunk_bottom = self.get_chunk((right, bottom))
+		if self.chunk_view != (chunk_left, chunk_top, chunk_right, chunk_bottom):
+			self.chunk_view = (chunk_left, chunk_top, chunk_right, chunk_bottom)
+			self.evict_chunks()
+		chunk_surfs = self.chunk_surfs
+		for chunk_x in range(chunk_left, chunk_right + 1):
+			for chunk_y in range(chunk_top, chunk_bottom + 1):
+				chunk = (chunk_x, chunk_y)
+				if chunk in chunk_surfs:
+					chunk_surfs.move_to_end(chunk)
+					chunk_surf = chunk_surfs[chunk]
 				else:
-					frames = self.animations[3]['frames']
-					index  = int(self.animations[3]['frame index'])
-					surf = frames[index]
-					self.display_surface.blit(surf, pos)
-
-			if tile.has_terrain:
-				terrain_string = ''.join(tile.terrain_neighbors)
-				terrain_style = terrain_string if terrain_string in self.land_tiles else 'X'
-				self.display_surface.blit(self.land_tiles[terrain_style], pos)
-
-			# coins
-			if tile.coin:
-				frames = self.animations[tile.coin]['frames']
-				index = int(self.animations[tile.coin]['frame index'])
-				surf = frames[index]
-				rect = surf.get_rect(center = (pos[0] + TILE_SIZE // 2, pos[1]+ TILE_SIZE // 2))
-				self.display_surface.blit(surf, rect)
-
-			# enemies
-			if tile.enemy:
-				frames = self.animations[tile.enemy]['frames']
-				index = int(self.animations[tile.enemy]['frame index'])
-				surf = frames[index]
-				rect = surf.get_rect(midbottom = (pos[0] + TILE_SIZE // 2, pos[1]+ TILE_SIZE))
-				self.display_surface.blit(surf, rect)
+					chunk_surf = self.render_chunk(chunk)
+				if chunk_surf:
+					surf, (offset_x, offset_y) = chunk_surf
+					blits.append((surf, (origin_x + chunk_x * chunk_pixels + offset_x, origin_y + chunk_y * chunk_pixels + offset_y)))
+
+		# current animation frame per tile id
+		frames = {tile_id: animation['frames'][int(animation['frame index'])] for tile_id, animation in self.animations.items()}
+		half = TILE_SIZE // 2
+
+		# animated content on top (enemies can reach above their cell, hence the margin)
+		left, top, right, bottom = self.visible_cells(margin = 2)
+		get_tile = self.canvas_data.get
+		for col in range(left, right + 1):
+			for row in range(top, bottom + 1):
+				tile = get_tile((col, row))
+				if not tile:
+					continue
+				x = origin_x + col * TILE_SIZE
+				y = origin_y + row * TILE_SIZE
+
+				# water surface
+				if tile.has_water and not tile.water_on_top:
+					blits.append((frames[3], (x, y)))
+
+					# keep terrain above the water, as in the chunk
+					if tile.has_terrain:
+						blits.append((self.land_lookup[tile.neighbor_mask], (x, y)))
+
+				# coins (centered)
+				if tile.coin:
+					surf = frames[tile.coin]
+					width, height = surf.get_size()
+					blits.append((surf, (int(x + half) - width // 2, int(y + half) - height // 2)))
+
+				# enemies (standing on the cell bottom)
+				if tile.enemy:
+					surf = frames[tile.enemy]
+					width, height = surf.get_size()
+					blits.append((surf, (int(x + half) - width // 2, int(y + TILE_SIZE) - height)))
+
+				# items (the chest stands, the rest are centered)
+				if tile.item:
+					surf = frames[tile.item]
+					width, height = surf.get_size()
+					if tile.item == 19:
+						blits.append((surf, (int(x + half) - width // 2, int(y + TILE_SIZE) - height)))
+					else:
+						blits.append((surf, (int(x + half) - width // 2, int(y + half) - height // 2)))
 
-			# items
-			if tile.item:
-				frames = self.animations[tile.item]['frames']
-				index = int(self.animations[tile.item]['frame index'])
-				surf = frames[index]
-				if tile.item == 19:
-					rect = surf.get_rect(midbottom = (pos[0] + TILE_SIZE // 2, pos[1] + TILE_SIZE))
-				else:
-					rect = surf.get_rect(center = (pos[0] + TILE_SIZE // 2, pos[1]+ TILE_SIZE // 2))
-				self.display_surface.blit(surf, rect)
-    
-		self.foreground.draw(self.display_surface)
+		blits += self.object_blits(self.foreground)
+		self.display_surface.blits(blits, doreturn = False)
 
 	def preview(self):
 		selected_object = self.mouse_on_object()
 		if not self.menu.rect.collidepoint(mouse_pos()):
 			if selected_object: # Drawing the highlight box around a hovered object
-				rect = selected_object.rect.inflate(10,10)
+				rect = selected_object.rect.move(self.origin).inflate(10,10)
 				color = 'black'
 				width = 3
 				size = 15
@@ -504,11 +792,9 @@ class Editor:
 				pygame.draw.lines(self.display_surface, color, False, ((rect.left,rect.bottom - size), rect.bottomleft, (rect.left + size,rect.bottom)), width)
 				
 			else: # Drawing the preview of the selected item
-				type_dict = {key: value['type'] for key, value in EDITOR_DATA.items()}
-				surf = self.preview_surfs[self.selection_index].copy()
-				surf.set_alpha(200)
+				surf = self.preview_surfs[self.selection_index]
 				
-				if type_dict[self.selection_index] == 'tile':
+				if TILE_TYPES[self.selection_index] == 'tile':
 					current_cell = self.get_current_cell()
 					rect = surf.get_rect(center = self.origin + vector(current_cell) * TILE_SIZE + vector(TILE_SIZE // 2, TILE_SIZE // 2))
 				else: # For objects
@@ -516,179 +802,259 @@ class Editor:
 				self.display_surface.blit(surf, rect)
 
 	def display_sky(self,dt):
-		self.display_surface.fill(SKY_COLOR)
-		y = self.sky_handle.rect.centery
-
-		# horizon lines
-		if y > 0:	
-			horizon_rect1 = pygame.Rect(0,y - 10,WINDOW_WIDTH,10)
-			horizon_rect2 = pygame.Rect(0,y - 16,WINDOW_WIDTH,4)
-			horizon_rect3 = pygame.Rect(0,y - 20,WINDOW_WIDTH,2)
-			pygame.draw.rect(self.display_surface, HORIZON_TOP_COLOR, horizon_rect1)
-			pygame.draw.rect(self.display_surface, HORIZON_TOP_COLOR, horizon_rect2)
-			pygame.draw.rect(self.display_surface, HORIZON_TOP_COLOR, horizon_rect3)
+		# sky, horizon and sea in one blit, the clouds stay above the horizon line
+		backdrop = get_backdrop()
+		y = self.sky_handle.rect.centery + self.origin.y
+		backdrop.draw(self.display_surface, y)
 
+		if y > 0:
+			self.display_surface.set_clip(backdrop.sky_rect(y))
 			self.display_clouds(dt, y)
-
-		# sea 
-		if 0 < y < WINDOW_HEIGHT:
-			sea_rect = pygame.Rect(0,y,WINDOW_WIDTH,WINDOW_HEIGHT)
-			pygame.draw.rect(self.display_surface, SEA_COLOR, sea_rect)
-			pygame.draw.line(self.display_surface, HORIZON_COLOR, (0,y), (WINDOW_WIDTH,y),3)
-		if y < 0:
-			self.display_surface.fill(SEA_COLOR)
+			self.display_surface.set_clip(None)
 
 	def display_clouds(self, dt, horizon_y):
-		for cloud in self.current_clouds: # [{surf, pos, speed}]
-			cloud['pos'][0] -= cloud['speed'] * dt
-			x = cloud['pos'][0]
-			y = horizon_y - cloud['pos'][1]
-			self.display_surface.blit(cloud['surf'], (x,y))
-
-	def create_clouds(self, event):
-		if event.type == self.cloud_timer:
-			surf = choice(self.cloud_surf)
-			surf = pygame.transform.scale2x(surf) if randint(0,4) < 2 else surf
-		
-			pos = [WINDOW_WIDTH + randint(50,100),randint(0,WINDOW_HEIGHT)]
-			self.current_clouds.append({'surf': surf, 'pos': pos, 'speed': randint(20,50)})
-
-			# remove clouds
-			self.current_clouds = [cloud for cloud in self.current_clouds if cloud['pos'][0] > -400]
-
-	def startup_clouds(self):
-		for i in range(20):
-			surf = pygame.transform.scale2x(choice(self.cloud_surf)) if randint(0,4) < 2 else choice(self.cloud_surf)
-			pos = [randint(0, WINDOW_WIDTH),randint(0, WINDOW_HEIGHT)]
-			self.current_clouds.append({'surf': surf, 'pos': pos, 'speed': randint(20,50)})
+		for layer in self.clouds:
+			layer.update(dt)
+			layer.draw(self.display_surface, -self.origin.x, horizon_y)
 
 	# update
 	def run(self, dt):
-		self.event_loop()
+		with profiler.section('events'):
+			self.event_loop()
 
 		# updating
-		self.animation_update(dt)
-		self.canvas_objects.update(dt)
-		self.object_timer.update()
+		with profiler.section('animation'):
+			self.animation_update(dt)
+		with profiler.section('objects'):
+			self.canvas_objects.update(dt)
+			if self.drag_object:
+				self.drag_object.drag(self.origin)
+				self.canvas_objects.move(self.drag_object)
+			self.object_timer.update()
 
 		# drawing
-		self.display_surface.fill('gray')
-		self.display_sky(dt)
-		self.draw_level()
-		self.draw_tile_lines()
+		with profiler.section('sky'):
+			self.display_sky(dt)
+		with profiler.section('draw_level'):
+			self.draw_level()
+		with profiler.section('draw_tile_lines'):
+			self.draw_tile_lines()
 		# pygame.draw.circle(self.display_surface, 'red', self.origin, 10)
-		self.preview()
-		self.menu.display(self.selection_index)
+		with profiler.section('preview'):
+			self.preview()
+			self.tool_preview()
+		with profiler.section('menu'):
+			self.menu.display(self.selection_index)
+		with profiler.section('minimap'):
+			self.minimap.draw(
+				self.display_surface,
+				pygame.Rect(-self.origin.x, -self.origin.y, WINDOW_WIDTH, WINDOW_HEIGHT),
+				[(self.player_object.rect.center, 'player')] if self.player_object.alive() else [])
+
+def grid_offset(cells, objects):
+	# top left cell of everything on the canvas, saved grids start at (0, 0)
+	object_cells = [(int(pos[0] // TILE_SIZE), int(pos[1] // TILE_SIZE)) for _, pos in objects]
+	all_cells = [cell for cell, *_ in cells] + object_cells
+	if not all_cells:
+		return 0, 0
+	return min(cell[0] for cell in all_cells), min(cell[1] for cell in all_cells)
+
+def build_grid(cells, objects):
+	# create an empty grid
+	layers = {
+		'water': {},
+		'bg palms': {},
+		'terrain': {}, 
+		'enemies': {},
+		'coins': {}, 
+		'fg objects': {},
+		'items': {},
+	}
+
+	# grid offset 
+	if not cells and not objects:
+		return layers
+	left, top = grid_offset(cells, objects)
 
-class CanvasTile:
-	def __init__(self, tile_id, offset = vector()):
+	# fill the grid
+	for tile_pos, (has_terrain, has_water, coin, enemy, item), neighbor_mask, water_on_top in cells:
+		x = (tile_pos[0] - left) * TILE_SIZE
+		y = (tile_pos[1] - top) * TILE_SIZE
 
-		# terrain
-		self.has_terrain = False
-		self.terrain_neighbors = []
+		if has_water:
+			layers['water'][(x,y)] = 'bottom' if water_on_top else 'top'
 
-		# water
-		self.has_water = False
-		self.water_on_top = False
+		if has_terrain:
+			layers['terrain'][(x,y)] = neighbor_mask
 
-		# coin
-		self.coin = None
+		if coin:
+			layers['coins'][(x + TILE_SIZE // 2,y + TILE_SIZE // 2)] = coin
+
+		if enemy:
+			layers['enemies'][(x,y)] = enemy
+
+		if item:
+			layers['items'][(x, y)] = item
+
+	for tile_id, pos in objects:
+		obj_pos = (int(pos[0] - left * TILE_SIZE), int(pos[1] - top * TILE_SIZE))
+		layers['bg palms' if tile_id in PALM_BG_IDS else 'fg objects'][obj_pos] = tile_id
+
+	return layers
+
+class CanvasTile:
+	# compact cell: bit flags, an 8 bit neighbor mask and small tile ids
+	__slots__ = ('flags', 'neighbor_mask', 'coin', 'enemy', 'item', 'objects')
 
-		# enemy
+	TERRAIN = 1
+	WATER = 2
+	WATER_ON_TOP = 4
+
+	def __init__(self, tile_id = None, offset = vector()):
+		self.flags = 0
+		self.neighbor_mask = 0 # one bit per NEIGHBOR_DIRECTIONS entry with terrain
+		self.coin = None
 		self.enemy = None
-  
-		# item
 		self.item = None
+		self.objects = () # (tile_id, offset) pairs
 
-		# objects
-		self.objects = []
+		if tile_id is not None:
+			self.add_id(tile_id, offset = offset)
+
+	# flag views
+	def get_flag(self, flag):
+		return bool(self.flags & flag)
+
+	def set_flag(self, flag, value):
+		self.flags = self.flags | flag if value else self.flags & ~flag
+
+	has_terrain = property(lambda self: self.get_flag(CanvasTile.TERRAIN), lambda self, value: self.set_flag(CanvasTile.TERRAIN, value))
+	has_water = property(lambda self: self.get_flag(CanvasTile.WATER), lambda self, value: self.set_flag(CanvasTile.WATER, value))
+	water_on_top = property(lambda self: self.get_flag(CanvasTile.WATER_ON_TOP), lambda self, value: self.set_flag(CanvasTile.WATER_ON_TOP, value))
 
-		self.add_id(tile_id, offset = offset)
-		self.is_empty = False
+	@property
+	def terrain_neighbors(self):
+		return list(NEIGHBOR_STRINGS[self.neighbor_mask])
+
+	@terrain_neighbors.setter
+	def terrain_neighbors(self, names):
+		self.neighbor_mask = sum(NEIGHBOR_BITS[name] for name in names)
+
+	@property
+	def is_empty(self):
+		return not (self.flags & (CanvasTile.TERRAIN | CanvasTile.WATER)) and not self.coin and not self.enemy and not self.item and not self.objects
 
 	def add_id(self, tile_id, offset = vector()):
-		options = {key: value['style'] for key, value in EDITOR_DATA.items()}
-		style = options.get(tile_id) # Use .get() for safety
+		style = TILE_STYLES.get(tile_id) # Use .get() for safety
 
-		if style == 'terrain': self.has_terrain = True
-		elif style == 'water': self.has_water = True
+		if style == 'terrain': self.flags |= CanvasTile.TERRAIN
+		elif style == 'water': self.flags |= CanvasTile.WATER
 		elif style == 'coin': self.coin = tile_id
 		elif style == 'enemy': self.enemy = tile_id
-		# --- MODIFIED BLOCK ---
-		elif style in ('chest', 'key', 'red_potion', 'blue_potion', 'map'): # <-- 'map' ĐƯỢC THÊM VÀO
+		elif style in ITEM_STYLES:
 			self.item = tile_id
-		# --- END MODIFIED BLOCK ---
 		elif style: 
 			if (tile_id, offset) not in self.objects:
-				self.objects.append((tile_id, offset))
-		self.check_content() 
+				self.objects += ((tile_id, offset),)
 
 	def remove_id(self, tile_id):
-		options = {key: value['style'] for key, value in EDITOR_DATA.items()}
-		style = options.get(tile_id)
+		style = TILE_STYLES.get(tile_id)
 
-		if style == 'terrain': self.has_terrain = False
-		elif style == 'water': self.has_water = False
+		if style == 'terrain': self.flags &= ~CanvasTile.TERRAIN
+		elif style == 'water': self.flags &= ~CanvasTile.WATER
 		elif style == 'coin': self.coin = None
 		elif style == 'enemy': self.enemy = None
-		# --- MODIFIED BLOCK ---
-		elif style in ('chest', 'key', 'red_potion', 'blue_potion', 'map'): 
+		elif style in ITEM_STYLES:
 			if self.item == tile_id:
 				self.item = None
-		# --- END MODIFIED BLOCK ---
-		self.check_content()
 
-	def check_content(self):
-		if not self.has_terrain and not self.has_water and not self.coin and not self.enemy and not self.objects and not self.item:
-			self.is_empty = True
+	@classmethod
+	def from_state(cls, state):
+		tile = cls()
+		tile.set_state(state)
+		return tile
+
+	def get_state(self):
+		return self.has_terrain, self.has_water, self.coin, self.enemy, self.item
+
+	def set_state(self, state):
+		has_terrain, has_water, self.coin, self.enemy, self.item = state
+		self.flags = (self.flags & CanvasTile.WATER_ON_TOP) | (CanvasTile.TERRAIN if has_terrain else 0) | (CanvasTile.WATER if has_water else 0)
 
 	def get_water(self):
 		return 'bottom' if self.water_on_top else 'top'
 
 	def get_terrain(self):
-		return ''.join(self.terrain_neighbors)
+		return NEIGHBOR_STRINGS[self.neighbor_mask]
+
+class ObjectIndex(pygame.sprite.Group):
+	# canvas objects, bucketed by their world rect for local hit tests
+	def __init__(self):
+		super().__init__()
+		self.spatial_hash = SpatialHash()
+
+	def add_internal(self, sprite, layer = None):
+		super().add_internal(sprite, layer)
+		self.spatial_hash.insert(sprite, sprite.rect)
+
+	def remove_internal(self, sprite):
+		super().remove_internal(sprite)
+		self.spatial_hash.remove(sprite)
+
+	def move(self, sprite):
+		self.spatial_hash.move(sprite, sprite.rect)
+
+	def at(self, world_pos):
+		hits = [sprite for sprite in self.spatial_hash.query_point(world_pos) if sprite.rect.collidepoint(world_pos)]
+		return min(hits, key = lambda sprite: sprite.order) if hits else None
+
+	def in_rect(self, world_rect):
+		return self.spatial_hash.query_rect(world_rect)
 
 class CanvasObject(pygame.sprite.Sprite):
+	count = 0
+
 	def __init__(self, pos, frames, tile_id, origin, group, anchor='center'):
-		super().__init__(group)
+		# creation order, keeps drawing and hit tests stable
+		CanvasObject.count += 1
+		self.order = CanvasObject.count
 		self.tile_id = tile_id
 
 		# animation
 		self.frames = frames
 		self.frame_index = 0
 
+		# rect is in world space (relative to the editor origin)
 		self.image = self.frames[self.frame_index]
 		self.rect = self.image.get_rect(**{anchor: pos})
+		self.rect.topleft = vector(self.rect.topleft) - origin
+		self.distance_to_origin = vector(self.rect.topleft)
+		super().__init__(group)
 
 		# movement
-		self.distance_to_origin = vector(self.rect.topleft) - origin
 		self.selected = False
 		self.mouse_offset = vector()
 
-	def start_drag(self):
+	def set_pos(self, pos):
+		self.rect.topleft = pos
+		self.distance_to_origin = vector(self.rect.topleft)
+
+	def start_drag(self, origin):
 		self.selected = True
-		self.mouse_offset = vector(mouse_pos()) - vector(self.rect.topleft)
+		self.mouse_offset = vector(mouse_pos()) - origin - vector(self.rect.topleft)
 
-	def drag(self):
+	def drag(self, origin):
 		if self.selected:
-			self.rect.topleft = mouse_pos() - self.mouse_offset
+			self.rect.topleft = vector(mouse_pos()) - origin - self.mouse_offset
 
-	def drag_end(self, origin):
+	def drag_end(self):
 		self.selected = False
-		self.distance_to_origin = vector(self.rect.topleft) - origin
+		self.distance_to_origin = vector(self.rect.topleft)
 
 	def animate(self, dt):
 		self.frame_index += ANIMATION_SPEED * dt
 		self.frame_index = 0 if self.frame_index >= len(self.frames) else self.frame_index
 		self.image = self.frames[int(self.frame_index)]
-		
-		# Only update rect for animated objects if they aren't the player/sky handle
-		if EDITOR_DATA[self.tile_id]['style'] not in ('player', 'sky'):
-			pass
-
-	def pan_pos(self, origin):
-		self.rect.topleft = origin + self.distance_to_origin
 
 	def update(self, dt):
 		self.animate(dt)
-		self.drag()
\ No newline at end of file
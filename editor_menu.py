@@ -2,6 +2,7 @@ import pygame, os, sys
 from pygame.image import load
 
 from settings import *
+from tile_registry import TILE_MENUS
 
 class EditorMenu:
 	def __init__(self):
@@ -52,13 +53,14 @@ class EditorMenu:
 				return sprite.get_id()
 
 	def highlight_indicator(self, index):
-		if EDITOR_DATA[index]['menu'] == 'terrain':
+		menu = TILE_MENUS[index]
+		if menu == 'terrain':
 			pygame.draw.rect(self.display_surface, BUTTON_LINE_COLOR, self.tile_button_rect.inflate(4,4),5,4)
-		if EDITOR_DATA[index]['menu'] == 'coin':
+		if menu == 'coin':
 			pygame.draw.rect(self.display_surface, BUTTON_LINE_COLOR, self.coin_button_rect.inflate(4,4),5,4)
-		if EDITOR_DATA[index]['menu'] == 'enemy':
+		if menu == 'enemy':
 			pygame.draw.rect(self.display_surface, BUTTON_LINE_COLOR, self.enemy_button_rect.inflate(4,4),5,4)
-		if EDITOR_DATA[index]['menu'] in ('palm bg', 'palm fg'):
+		if menu in ('palm bg', 'palm fg'):
 			pygame.draw.rect(self.display_surface, BUTTON_LINE_COLOR, self.palm_button_rect.inflate(4,4),5,4)
 
 	def display(self, index):
@@ -0,0 +1,80 @@
+import numpy as np
+
+from settings import *
+
+class Effects:
+	# many short animations (coin sparkles) as arrays, advanced in one vectorized step and drawn with one blits call
+	fields = ('pos', 'size', 'frame', 'frame_speed', 'length', 'sheet')
+
+	def __init__(self, capacity = 64):
+		self.count = 0
+		self.pos = np.zeros((capacity, 2)) # topleft in world pixels
+		self.size = np.zeros((capacity, 2))
+		self.frame = np.zeros(capacity)
+		self.frame_speed = np.zeros(capacity)
+		self.length = np.zeros(capacity) # the effect ends when frame reaches it
+		self.sheet = np.zeros(capacity, dtype = int) # index into self.sheets
+
+		self.sheets = [] # frame lists, shared between effects
+		self.sheet_ids = {} # id(frames) -> index in self.sheets
+
+	def grow(self):
+		for name in self.fields:
+			array = getattr(self, name)
+			bigger = np.zeros((len(array) * 2,) + array.shape[1:], dtype = array.dtype)
+			bigger[:self.count] = array[:self.count]
+			setattr(self, name, bigger)
+
+	def spawn(self, frames, topleft, frame_speed = ANIMATION_SPEED):
+		# plays frames once at frame_speed frames per second
+		if id(frames) not in self.sheet_ids:
+			self.sheet_ids[id(frames)] = len(self.sheets)
+			self.sheets.append(frames)
+		if self.count == len(self.pos):
+			self.grow()
+
+		index = self.count
+		self.pos[index] = topleft
+		self.size[index] = frames[0].get_size()
+		self.frame[index] = 0
+		self.frame_speed[index] = frame_speed
+		self.length[index] = len(frames)
+		self.sheet[index] = self.sheet_ids[id(frames)]
+		self.count += 1
+
+	def spawn_centered(self, frames, center, **kwargs):
+		width, height = frames[0].get_size()
+		self.spawn(frames, (center[0] - width // 2, center[1] - height // 2), **kwargs)
+
+	def update(self, dt):
+		count = self.count
+		if not count:
+			return
+		self.frame[:count] += self.frame_speed[:count] * dt
+
+		# drop finished effects by packing the rest to the front
+		done = self.frame[:count] >= self.length[:count]
+		if done.any():
+			keep = ~done
+			for name in self.fields:
+				array = getattr(self, name)
+				kept = array[:count][keep]
+				array[:len(kept)] = kept
+			self.count = int(keep.sum())
+
+	def draw(self, surface, offset):
+		count = self.count
+		if not count:
+			return
+		screen_pos = np.round(self.pos[:count] - (offset.x, offset.y)).astype(int)
+		size = self.size[:count]
+		visible = (
+			(screen_pos[:, 0] + size[:, 0] > 0) & (screen_pos[:, 0] < surface.get_width()) &
+			(screen_pos[:, 1] + size[:, 1] > 0) & (screen_pos[:, 1] < surface.get_height()))
+
+		sheets = self.sheets
+		visible_effects = zip(
+			self.sheet[:count][visible].tolist(),
+			self.frame[:count][visible].astype(int).tolist(),
+			screen_pos[visible].tolist())
+		surface.blits([(sheets[sheet][frame], pos) for sheet, frame, pos in visible_effects], doreturn = False)
@@ -1,14 +1,15 @@
 # end_menu.py
 import pygame
 from settings import *
+from render import get_target
 from pygame.math import Vector2 as vector
 
 class EndMenu:
-    def __init__(self, coin_counts, switch_to_menu_callback, background_level=None):
-        self.display_surface = pygame.display.get_surface()
+    def __init__(self, coin_counts, switch_to_menu_callback, background=None):
+        self.display_surface = get_target()
         self.coin_counts = coin_counts
         self.switch_to_menu = switch_to_menu_callback # This will be main.switch
-        self.background_level = background_level
+        self.background = background # frozen frame of the finished level
         
         # Load assets
         self.board_surf = pygame.image.load('assets/graphics/end-menu/board.png').convert_alpha()
@@ -31,6 +32,10 @@ class EndMenu:
 
         self.active = True
 
+        # Nothing moves on this screen: draw it once, then present nothing
+        self.drawn = False
+        self.dirty_rects = None
+
     def draw_text(self, text, pos, color=(80, 80, 80), stroke_color='#ffffff'):
         # Simple stroke effect
         stroke_offsets = [(-1, 0), (1, 0), (0, -1), (0, 1)]
@@ -57,17 +62,16 @@ class EndMenu:
                 if self.menu_button_rect.collidepoint(event.pos):
                     self.active = False
                     return 'menu'
+            if event.type == pygame.WINDOWEXPOSED:
+                self.drawn = False
+
+        if self.drawn:
+            self.dirty_rects = []
+            return None
 
         # Drawing
-        if self.background_level:
-            try:
-                self.background_level.all_sprites.custom_draw(self.background_level.player)
-                self.background_level.draw_player_health_bar()
-                self.background_level.draw_coin_hud()
-                self.background_level.inventory.display() 
-            except Exception as e:
-                print(f"Error drawing background level: {e}")
-                self.display_surface.fill(SKY_COLOR)
+        if self.background is not None:
+            self.display_surface.blit(self.background, (0, 0))
         else:
             self.display_surface.fill(SKY_COLOR)
         
@@ -100,5 +104,6 @@ class EndMenu:
         # Draw menu button
         self.display_surface.blit(self.menu_button_surf, self.menu_button_rect)
 
-        pygame.display.update()
+        self.drawn = True
+        self.dirty_rects = None
         return None 
\ No newline at end of file
@@ -0,0 +1,81 @@
+from collections import deque
+from pygame.math import Vector2 as vector
+
+from settings import *
+
+class Stroke:
+	def __init__(self):
+		# cell -> [state before, state after], state None means no tile
+		self.cells = {}
+		# canvas object -> [position before, position after], None means removed
+		self.objects = {}
+
+	def __len__(self):
+		return len(self.cells) + len(self.objects)
+
+class History:
+	def __init__(self, limit = UNDO_LIMIT):
+		self.limit = limit # max number of cell / object deltas kept
+		self.size = 0
+
+		self.undo_stack = deque()
+		self.redo_stack = []
+		self.stroke = None
+
+	# recording
+	def record_cell(self, cell, state):
+		if not self.stroke:
+			self.stroke = Stroke()
+		if cell not in self.stroke.cells: # first touch keeps the original state
+			self.stroke.cells[cell] = [state, None]
+
+	def record_object(self, obj, pos):
+		if not self.stroke:
+			self.stroke = Stroke()
+		if obj not in self.stroke.objects:
+			self.stroke.objects[obj] = [vector(pos) if pos is not None else None, None]
+
+	def commit(self, cell_state):
+		stroke, self.stroke = self.stroke, None
+		if not stroke:
+			return False
+
+		# final states, dropping cells and objects that ended where they started
+		for cell, states in list(stroke.cells.items()):
+			states[1] = cell_state(cell)
+			if states[0] == states[1]:
+				del stroke.cells[cell]
+
+		for obj, states in list(stroke.objects.items()):
+			states[1] = vector(obj.distance_to_origin) if obj.alive() else None
+			if states[0] == states[1]:
+				del stroke.objects[obj]
+
+		if not stroke:
+			return False
+
+		self.undo_stack.append(stroke)
+		self.size += len(stroke)
+		self.redo_stack.clear()
+
+		# memory cap, the latest stroke is always kept
+		while self.size > self.limit and len(self.undo_stack) > 1:
+			self.size -= len(self.undo_stack.popleft())
+		return True
+
+	# replay
+	def undo(self):
+		if self.stroke or not self.undo_stack:
+			return None
+		stroke = self.undo_stack.pop()
+		self.size -= len(stroke)
+		self.redo_stack.append(stroke)
+		return {cell: states[0] for cell, states in stroke.cells.items()}, {obj: states[0] for obj, states in stroke.objects.items()}
+
+	def redo(self):
+		if self.stroke or not self.redo_stack:
+			return None
+		stroke = self.redo_stack.pop()
+		self.undo_stack.append(stroke)
+		self.size += len(stroke)
+		return {cell: states[1] for cell, states in stroke.cells.items()}, {obj: states[1] for obj, states in stroke.objects.items()}
@@ -1,16 +1,22 @@
 import pygame
 from settings import *
+from render import get_target
 
 class Inventory:
 	def __init__(self, player, inventory_assets):
 		self.player = player
-		self.display_surface = pygame.display.get_surface()
+		self.display_surface = get_target()
 		self.visible = False
 
 		# Tải hình ảnh và font chữ
 		self.cell_surf = inventory_assets['cell']
 		self.item_surfs = inventory_assets['items']
 		self.font = pygame.font.Font(None, 24)
+		self.count_surfs = {} # số lượng -> (stroke surf, text surf)
+
+		# Khung highlight vẽ sẵn một lần
+		self.highlight_surf = pygame.Surface(self.cell_surf.get_size(), pygame.SRCALPHA)
+		pygame.draw.rect(self.highlight_surf, '#f5e669', self.highlight_surf.get_rect(), 4, 4)
   
 		self.selection_index = 0
 		self.selection_timer = pygame.time.get_ticks()
@@ -82,41 +88,36 @@ class Inventory:
 		# Lấy danh sách các vật phẩm người chơi đang có
 		display_items = list(self.player.inventory.keys())
 
-		# Vẽ các ô và vật phẩm
+		# Vẽ các ô, vật phẩm và số lượng bằng một lần blits
+		blits = []
 		for index in range(3):
 			cell_x = start_x + index * (self.cell_surf.get_width() + 10)
 			cell_rect = self.cell_surf.get_rect(bottomleft=(cell_x, bottom_y))
-			self.display_surface.blit(self.cell_surf, cell_rect)
+			blits.append((self.cell_surf, cell_rect))
 
 			if index < len(display_items):
 				item_name = display_items[index]
 				item_surf = self.item_surfs[item_name]
-				item_rect = item_surf.get_rect(center=cell_rect.center)
-				self.display_surface.blit(item_surf, item_rect)
+				blits.append((item_surf, item_surf.get_rect(center=cell_rect.center)))
 
 				item_count = self.player.inventory[item_name]
-				item_count_text = str(item_count)
-				stroke_color = '#3e3546'
-				text_color = (255, 255, 255)
-
 				if item_count > 1:
-					# text_surf = self.font.render(str(item_count), False, '#3e3546')
-					# text_rect = text_surf.get_rect(bottomright=cell_rect.bottomright - pygame.math.Vector2(5, 5))
-					# self.display_surface.blit(text_surf, text_rect)
-					
-					# Stroke
-					stroke_offsets = [(-1, 0), (1, 0), (0, -1), (0, 1)]
-					for offset in stroke_offsets:
-						stroke_surf = self.font.render(item_count_text, True, stroke_color)
-						stroke_rect = stroke_surf.get_rect(bottomright=cell_rect.bottomright - pygame.math.Vector2(5, 5))
-						stroke_rect.move_ip(offset)
-						self.display_surface.blit(stroke_surf, stroke_rect)
-
-					# Main text
-					text_surf = self.font.render(item_count_text, True, text_color)
+					stroke_surf, text_surf = self.count_text(item_count)
 					text_rect = text_surf.get_rect(bottomright=cell_rect.bottomright - pygame.math.Vector2(5, 5))
-					self.display_surface.blit(text_surf, text_rect)
+
+					# Stroke, sau đó là chữ chính
+					stroke_offsets = [(-1, 0), (1, 0), (0, -1), (0, 1)]
+					blits += [(stroke_surf, text_rect.move(offset)) for offset in stroke_offsets]
+					blits.append((text_surf, text_rect))
 
 			# Vẽ highlight cho ô được chọn
 			if index == self.selection_index:
-				pygame.draw.rect(self.display_surface, '#f5e669', cell_rect, 4, 4)
\ No newline at end of file
+				blits.append((self.highlight_surf, cell_rect))
+		self.display_surface.blits(blits, doreturn=False)
+
+	def count_text(self, item_count):
+		# chỉ render lại khi số lượng thay đổi
+		if item_count not in self.count_surfs:
+			text = str(item_count)
+			self.count_surfs[item_count] = (self.font.render(text, True, '#3e3546'), self.font.render(text, True, (255, 255, 255)))
+		return self.count_surfs[item_count]
@@ -1,18 +1,32 @@
 import pygame, sys, os
+import numpy as np
 from pygame.math import Vector2 as vector
 
 from settings import *
 from support import *
 
-from sprites import Generic, Block, Animated, Particle, Coin, Player, Spikes, Tooth, Shell, Cloud, Item, Chest, Pearl, Crabby 
+from sprites import Generic, Block, Animated, Coin, Player, Spikes, Tooth, Shell, Item, Chest, Pearl, Crabby
 from inventory import Inventory
 from option_menu import OptionMenu
-
-from random import choice, randint
+from effects import Effects
+from render import get_target, canvas, draw_scaled
+from backdrop import get_backdrop, cloud_layers
+from profiler import profiler
+from minimap import Minimap, cell_color, BOSS_ID, CHEST_ID
+from tile_registry import TILE_LAYERS, terrain_mask
+
+MINIMAP_LAYERS = ('terrain', 'water', 'coins', 'enemies', 'items') # order of cell_color arguments
+
+def update_kind(sprite_type):
+	# how the activity scheduler treats a sprite class
+	if sprite_type.update is pygame.sprite.Sprite.update: return 'static' # nothing to update
+	if issubclass(sprite_type, (Tooth, Shell, Crabby)): return 'enemy' # frozen when far away
+	if issubclass(sprite_type, (Coin, Item, Chest)) or sprite_type is Animated: return 'decoration' # slowed when far away
+	return 'always' # player, projectiles, particles
 
 class Level:
-	def __init__(self, grid, switch, asset_dict, audio):
-		self.display_surface = pygame.display.get_surface()
+	def __init__(self, grid, switch, asset_dict, audio, static_cache = None, chunk_key = None):
+		self.display_surface = get_target()
 		self.switch = switch
 
 		if grid.get('terrain'):
@@ -36,6 +50,8 @@ class Level:
 
 		# Chest
 		self.pending_chests = []
+		self.chests = []
+		self.enemy_cells = {}
 		self.boss_defeated = False
 
 		# Boundary walls setup
@@ -48,11 +64,16 @@ class Level:
 		self.last_checkpoint = None
 
 		# Build the level
-		self.build_level(grid, asset_dict, audio['jump'], audio['hit']) 
+		self.build_level(grid, asset_dict, audio['jump'], audio['hit'], static_cache, chunk_key)
 
 		# Assets and UI setup.
 		self.particle_surfs = asset_dict['particle']
-		self.cloud_surfs = asset_dict['clouds']
+
+		# Parallax cloud layers and particles, drawn outside of all_sprites
+		self.clouds = cloud_layers(asset_dict['clouds'])
+		self.particles = Effects()
+		self.all_sprites.clouds = self.clouds
+		self.all_sprites.front_effects = self.particles
 		self.player_health_bar = asset_dict['player_health_bar']
 		self.inventory = Inventory(self.player, asset_dict['inventory']) 
 		self.item_effects = asset_dict['item_effects']
@@ -63,11 +84,7 @@ class Level:
 			self.hud_font = pygame.font.Font(FONT, 24)
 		except Exception:
 			self.hud_font = pygame.font.Font(None, 28)
-
-		# Cloud timer setup
-		self.cloud_timer = pygame.USEREVENT + 2
-		pygame.time.set_timer(self.cloud_timer, 2000)
-		self.startup_clouds()
+		self.hud_text_cache = {} # (text, font, color, stroke color) -> (stroke surf, text surf)
 
 		# Sounds setup
 		self.bg_music = audio['music']
@@ -83,25 +100,36 @@ class Level:
 			sfx_sounds=audio
 		)
 		self.option_menu.from_menu = False
+
+		# Presenting: None pushes the whole frame, otherwise only these rects
+		self.dirty_rects = None
+		self.paused_frame = None # the world behind the pause board, captured once
+
+		# Activity scheduler
+		self.update_kinds = {} # sprite class -> update_kind
+		self.frame_count = 0
+		self.activity = {'active': 0, 'slowed': 0, 'frozen': 0, 'static': 0, 'effects': 0}
+		self.debug_active = False
+
+		# Minimap setup
+		self.minimap = Minimap((WINDOW_WIDTH - 20, self.option_menu.pause_rect.bottom + 10))
+		self.setup_minimap(grid)
  
-	def build_level(self, grid, asset_dict, jump_sound, hit_sound):
+	def build_level(self, grid, asset_dict, jump_sound, hit_sound, static_cache = None, chunk_key = None):
 		# Create Player first
 		player_pos = (0,0) # default
-		for layer_name, layer in grid.items():
-			for pos, data in layer.items():
-				if data == 0: player_pos = pos; break
+		for pos, data in grid.get(TILE_LAYERS[0], {}).items():
+			if data == 0: player_pos = pos; break
 		self.player_start_pos = vector(player_pos)
 		self.player = Player(player_pos, asset_dict['player'], self.all_sprites, self.collision_sprites, jump_sound)
 
+		self.build_static(grid, asset_dict, static_cache, chunk_key)
+
 		# Build everything else
 		for layer_name, layer in grid.items():
+			if layer_name in ('terrain', 'water'): continue # built above, the other layers hold tile ids
 			for pos, data in layer.items():
-				if layer_name == 'terrain':
-					Generic(pos, asset_dict['land'][data], [self.all_sprites, self.collision_sprites])
-				if layer_name == 'water':
-					if data == 'top': Animated(asset_dict['water top'], pos, self.all_sprites, LEVEL_LAYERS['water'])
-					else: Generic(pos, asset_dict['water bottom'], self.all_sprites, LEVEL_LAYERS['water'])
-
+				enemy = None
 				match data:
 					# case 0 handled above
 					case 1: self.horizon_y = pos[1]; self.all_sprites.horizon_y = pos[1]
@@ -109,9 +137,9 @@ class Level:
 					case 5: Coin('silver', asset_dict['silver'], pos, [self.all_sprites, self.coin_sprites])
 					case 6: Coin('diamond', asset_dict['diamond'], pos, [self.all_sprites, self.coin_sprites])
 					case 7: Spikes(asset_dict['spikes'], pos, [self.all_sprites, self.damage_sprites])
-					case 8: Tooth(asset_dict['tooth'], pos, [self.all_sprites, self.attackable_sprites], self.collision_sprites, asset_dict['small_health_bar'])
-					case 9: Shell('left', asset_dict['shell'], pos, [self.all_sprites, self.collision_sprites, self.shell_sprites, self.attackable_sprites], asset_dict['pearl'], asset_dict['pearl_destroyed'], self.damage_sprites, asset_dict['small_health_bar'], self.attackable_sprites, self.collision_sprites)
-					case 10: Shell('right', asset_dict['shell'], pos, [self.all_sprites, self.collision_sprites, self.shell_sprites, self.attackable_sprites], asset_dict['pearl'], asset_dict['pearl_destroyed'], self.damage_sprites, asset_dict['small_health_bar'], self.attackable_sprites, self.collision_sprites)
+					case 8: enemy = Tooth(asset_dict['tooth'], pos, [self.all_sprites, self.attackable_sprites], self.collision_sprites, asset_dict['small_health_bar'])
+					case 9: enemy = Shell('left', asset_dict['shell'], pos, [self.all_sprites, self.collision_sprites, self.shell_sprites, self.attackable_sprites], asset_dict['pearl'], asset_dict['pearl_destroyed'], self.damage_sprites, asset_dict['small_health_bar'], self.attackable_sprites, self.collision_sprites)
+					case 10: enemy = Shell('right', asset_dict['shell'], pos, [self.all_sprites, self.collision_sprites, self.shell_sprites, self.attackable_sprites], asset_dict['pearl'], asset_dict['pearl_destroyed'], self.damage_sprites, asset_dict['small_health_bar'], self.attackable_sprites, self.collision_sprites)
 					case 11: Animated(asset_dict['palms']['small_fg'], pos, self.all_sprites); Block(pos, (76,50), self.collision_sprites)
 					case 12: Animated(asset_dict['palms']['large_fg'], pos, self.all_sprites); Block(pos, (76,50), self.collision_sprites)
 					case 13: Animated(asset_dict['palms']['left_fg'], pos, self.all_sprites); Block(pos, (76,50), self.collision_sprites)
@@ -128,16 +156,151 @@ class Level:
 						midbottom_pos = (pos[0] + TILE_SIZE//2, pos[1] + TILE_SIZE)
 						Crabby(asset_dict['crabby'], midbottom_pos, [self.all_sprites, self.attackable_sprites, self.boss_sprites, self.damage_sprites], self.collision_sprites, self.item_sprites, self.attackable_sprites, asset_dict['boss_health_bar'], self.player, None, 'midbottom')
 					case 24: Item('map', asset_dict['items']['map'], pos, [self.all_sprites, self.collision_sprites, self.item_sprites])
+				if enemy: self.enemy_cells[enemy] = pos # cleared from the minimap when it dies
 
 		for sprite in self.shell_sprites: sprite.player = self.player
 		for sprite in self.attackable_sprites:
 			if isinstance(sprite, Tooth): sprite.player = self.player
 
+		self.setup_proximity([sprite for sprite in self.attackable_sprites if isinstance(sprite, (Tooth, Shell, Crabby))])
+
+	def build_static(self, grid, asset_dict, static_cache = None, chunk_key = None):
+		# terrain and water never change during play, so a play-test keeps their sprites per
+		# editor chunk (chunk_key gives chunk + version) and only rebuilds the chunks that changed
+		chunks = {}
+		for layer_name in ('terrain', 'water'):
+			for pos, data in grid.get(layer_name, {}).items():
+				key = chunk_key(pos) if chunk_key else None
+				chunks.setdefault(key, []).append((layer_name, pos, data))
+
+		cache = static_cache if static_cache is not None else {}
+		built = {}
+		self.static_chunks_built = 0
+		for key, tiles in chunks.items():
+			sprites = cache.get(key) if key is not None else None
+			if sprites:
+				for sprite in sprites:
+					sprite.kill() # still in the groups of the previous play-test
+					sprite.add(self.all_sprites)
+					if sprite.z != LEVEL_LAYERS['water']: sprite.add(self.collision_sprites)
+			else:
+				sprites = []
+				for layer_name, pos, data in tiles:
+					if layer_name == 'terrain':
+						sprites.append(Generic(pos, asset_dict['land'][terrain_mask(data)], [self.all_sprites, self.collision_sprites]))
+					elif data == 'top': sprites.append(Animated(asset_dict['water top'], pos, self.all_sprites, LEVEL_LAYERS['water']))
+					else: sprites.append(Generic(pos, asset_dict['water bottom'], self.all_sprites, LEVEL_LAYERS['water']))
+				self.static_chunks_built += 1
+			built[key] = sprites
+
+		if static_cache is not None:
+			static_cache.clear()
+			static_cache.update(built)
+
+	def setup_minimap(self, grid):
+		# cell -> [terrain, water, coin, enemy, item], kept to repaint a cell when something on it is gone
+		self.minimap_cells = {}
+		for index, layer_name in enumerate(MINIMAP_LAYERS):
+			for pos, data in grid.get(layer_name, {}).items():
+				if layer_name in ('enemies', 'items') and data in (BOSS_ID, CHEST_ID): continue # live markers instead
+				cell = (int(pos[0] // TILE_SIZE), int(pos[1] // TILE_SIZE))
+				self.minimap_cells.setdefault(cell, [False, False, None, None, None])[index] = True if index < 2 else data
+		self.minimap.paint((cell, cell_color(*state)) for cell, state in self.minimap_cells.items())
+
+	def minimap_remove(self, pos, layer_name):
+		cell = (int(pos[0] // TILE_SIZE), int(pos[1] // TILE_SIZE))
+		state = self.minimap_cells.get(cell)
+		if state:
+			state[MINIMAP_LAYERS.index(layer_name)] = None
+			self.minimap.paint([(cell, cell_color(*state))])
+
+	def draw_minimap(self):
+		markers = [(self.player.rect.center, 'player')]
+		markers += [(boss.rect.center, 'boss') for boss in self.boss_sprites if boss.is_alive]
+		markers += [((chest['pos'][0] + TILE_SIZE // 2, chest['pos'][1] + TILE_SIZE // 2), 'chest') for chest in self.pending_chests]
+		markers += [(chest.rect.center, 'chest') for chest in self.chests if chest.alive()]
+		self.minimap.draw(self.display_surface, pygame.Rect(self.all_sprites.offset, (WINDOW_WIDTH, WINDOW_HEIGHT)), markers)
+
+	def setup_proximity(self, enemies):
+		# enemy centers and Crabby boss areas as arrays, rebuilt only when an enemy is gone
+		self.proximity_enemies = enemies
+		self.enemy_centers = np.zeros((len(enemies), 2))
+		no_area = (np.nan, np.nan, np.nan, np.nan) # comparisons with nan are False, never in an area
+		self.boss_areas = np.array([
+			(sprite.boss_area.left, sprite.boss_area.top, sprite.boss_area.right, sprite.boss_area.bottom) if isinstance(sprite, Crabby) else no_area
+			for sprite in enemies], dtype = float).reshape(-1, 4)
+
+	def enemy_proximity(self):
+		# one NumPy pass per frame instead of a distance / colliderect per enemy
+		enemies = [sprite for sprite in self.proximity_enemies if sprite.alive()]
+		if len(enemies) != len(self.proximity_enemies):
+			self.setup_proximity(enemies)
+		if not enemies:
+			return
+
+		player = self.player.rect
+		centers = self.enemy_centers
+		centers[:] = [sprite.rect.center for sprite in enemies]
+		distances_sq = ((centers - player.center) ** 2).sum(axis = 1)
+		areas = self.boss_areas
+		in_area = (areas[:, 0] < player.right) & (areas[:, 2] > player.left) & (areas[:, 1] < player.bottom) & (areas[:, 3] > player.top)
+
+		for sprite, distance_sq, inside in zip(enemies, distances_sq.tolist(), in_area.tolist()):
+			if isinstance(sprite, Crabby): sprite.player_in_area = inside
+			else: sprite.player_distance_sq = distance_sq
+
+	def update_sprites(self, dt, include_player = True):
+		# full updates near the camera, far away enemies freeze and decorations catch up every DORMANT_TICK frames
+		active_rect = pygame.Rect(self.all_sprites.offset, (WINDOW_WIDTH, WINDOW_HEIGHT)).inflate(ACTIVATION_MARGIN * 2, ACTIVATION_MARGIN * 2)
+		timed = profiler.enabled # per class timings of the sprite updates
+
+		# the player moves first, the enemies then react to where it is in this frame
+		if include_player:
+			if timed: profiler.update_sprite(self.player, dt)
+			else: self.player.update(dt)
+		with profiler.section('enemy_proximity'):
+			self.enemy_proximity()
+		with profiler.section('update_effects'):
+			for layer in self.clouds:
+				layer.update(dt)
+			self.particles.update(dt)
+		self.frame_count += 1
+		phase = self.frame_count % DORMANT_TICK
+		activity = dict.fromkeys(self.activity, 0)
+
+		for sprite in self.all_sprites.sprites():
+			kind = self.update_kinds.get(type(sprite))
+			if kind is None:
+				kind = self.update_kinds[type(sprite)] = update_kind(type(sprite))
+
+			if kind == 'static':
+				activity['static'] += 1
+			elif kind == 'always' or active_rect.colliderect(sprite.rect):
+				if sprite is not self.player: # updated above
+					if timed: profiler.update_sprite(sprite, dt)
+					else: sprite.update(dt)
+				activity['active'] += 1
+			elif kind == 'enemy':
+				activity['frozen'] += 1
+			else:
+				if sprite.tick_phase == phase:
+					if timed: profiler.update_sprite(sprite, dt * DORMANT_TICK)
+					else: sprite.update(dt * DORMANT_TICK)
+				activity['slowed'] += 1
+		activity['effects'] = self.particles.count
+		self.activity = activity
+
+	def draw_debug(self):
+		# F3: scheduler counters
+		text = '  '.join(f'{name} {count}' for name, count in self.activity.items())
+		self.draw_hud_text(self.display_surface, text, (20, WINDOW_HEIGHT - 30), self.hud_font)
+
 	def get_coins(self):
 		collided_coins = pygame.sprite.spritecollide(self.player, self.coin_sprites, True)
 		for sprite in collided_coins:
 			self.coin_sound.play()
-			Particle(self.particle_surfs, sprite.rect.center, self.all_sprites)
+			self.particles.spawn_centered(self.particle_surfs, sprite.rect.center)
+			self.minimap_remove(sprite.rect.center, 'coins')
    
 			if sprite.coin_type in self.player.coin_counts:
 				self.player.coin_counts[sprite.coin_type] += 1
@@ -167,19 +330,22 @@ class Level:
 		self.display_surface.blit(bar_surf, bar_pos)
 		self.display_surface.blit(red_surf, red_pos, red_crop_rect)
 
-	def draw_hud_text(self, surface, text, pos, font, color=(255, 255, 255), stroke_color='#3e3546'):
-		# Stroke
-		stroke_offsets = [(-1, 0), (1, 0), (0, -1), (0, 1)]
-		for offset in stroke_offsets:
-			stroke_surf = font.render(text, True, stroke_color)
-			stroke_rect = stroke_surf.get_rect(midleft=pos)
-			stroke_rect.move_ip(offset)
-			surface.blit(stroke_surf, stroke_rect)
-
-		# Main text
-		text_surf = font.render(text, True, color)
+	def hud_text_blits(self, text, pos, font, color=(255, 255, 255), stroke_color='#3e3546'):
+		# rendered once per string, the counters only change on pickups
+		key = (text, font, color, stroke_color)
+		if key not in self.hud_text_cache:
+			if len(self.hud_text_cache) >= HUD_TEXT_CACHE:
+				self.hud_text_cache.clear()
+			self.hud_text_cache[key] = (font.render(text, True, stroke_color), font.render(text, True, color))
+		stroke_surf, text_surf = self.hud_text_cache[key]
+
+		# Stroke, then the main text
 		text_rect = text_surf.get_rect(midleft=pos)
-		surface.blit(text_surf, text_rect)
+		stroke_offsets = [(-1, 0), (1, 0), (0, -1), (0, 1)]
+		return [(stroke_surf, text_rect.move(offset)) for offset in stroke_offsets] + [(text_surf, text_rect)]
+
+	def draw_hud_text(self, surface, text, pos, font, color=(255, 255, 255), stroke_color='#3e3546'):
+		surface.blits(self.hud_text_blits(text, pos, font, color, stroke_color), doreturn=False)
   
 	def draw_coin_hud(self):
 		# Position below health bar
@@ -188,38 +354,16 @@ class Level:
 		text_offset = vector(5, 0)
 		icon_spacing = 90 # Space between start of icons
 
-		# Silver 
-		silver_img = self.hud_assets['silver']
-		silver_rect = silver_img.get_rect(topleft=(start_x, start_y))
-		self.display_surface.blit(silver_img, silver_rect)
-		self.draw_hud_text(
-			self.display_surface,
-			f"x{self.player.coin_counts['silver']}",
-			silver_rect.midright + text_offset,
-			self.hud_font
-		)
-
-		# Gold
-		gold_img = self.hud_assets['gold']
-		gold_rect = gold_img.get_rect(topleft=(silver_rect.left + icon_spacing, start_y))
-		self.display_surface.blit(gold_img, gold_rect)
-		self.draw_hud_text(
-			self.display_surface,
-			f"x{self.player.coin_counts['gold']}",
-			gold_rect.midright + text_offset,
-			self.hud_font
-		)
-
-		# Diamond
-		diamond_img = self.hud_assets['diamond']
-		diamond_rect = diamond_img.get_rect(topleft=(gold_rect.left + icon_spacing, start_y))
-		self.display_surface.blit(diamond_img, diamond_rect)
-		self.draw_hud_text(
-			self.display_surface,
-			f"x{self.player.coin_counts['diamond']}",
-			diamond_rect.midright + text_offset,
-			self.hud_font
-		)
+		# Silver, gold and diamond icons with their counters, in one blits call
+		blits = []
+		left = start_x
+		for coin in ('silver', 'gold', 'diamond'):
+			image = self.hud_assets[coin]
+			rect = image.get_rect(topleft=(left, start_y))
+			blits.append((image, rect))
+			blits += self.hud_text_blits(f"x{self.player.coin_counts[coin]}", rect.midright + text_offset, self.hud_font)
+			left += icon_spacing
+		self.display_surface.blits(blits, doreturn=False)
 
 	def player_attack(self):
 		if self.player.attack_timer.active:
@@ -229,6 +373,8 @@ class Level:
 			for enemy in self.attackable_sprites:
 				if enemy.rect.colliderect(attack_rect):
 					enemy.damage(damage)
+					if enemy in self.enemy_cells and not enemy.is_alive:
+						self.minimap_remove(self.enemy_cells.pop(enemy), 'enemies')
 
 	def tooth_attack_damage(self):
 		for sprite in self.attackable_sprites:
@@ -277,8 +423,9 @@ class Level:
 						self.save_checkpoint(sprite.rect.midbottom)
 						self.coin_sound.play()
 						effect_surf = self.item_effects['key']
-						Particle(effect_surf, sprite.rect.center, self.all_sprites)
+						self.particles.spawn_centered(effect_surf, sprite.rect.center)
 						sprite.kill()
+						self.minimap_remove(sprite.rect.topleft, 'items')
 						return True
 					if len(self.player.inventory) < 3 or item_style in self.player.inventory:
 						if item_style == 'key':
@@ -289,8 +436,9 @@ class Level:
 						self.coin_sound.play()
 						effect_surf = self.item_effects.get(item_style, self.item_effects.get('potion')) 
 						if effect_surf: 
-							Particle(effect_surf, sprite.rect.center, self.all_sprites)
+							self.particles.spawn_centered(effect_surf, sprite.rect.center)
 						sprite.kill()
+						self.minimap_remove(sprite.rect.topleft, 'items')
 						return True
 		return False
 
@@ -304,104 +452,148 @@ class Level:
 	def spawn_chests(self):
 		print("Boss defeated! Spawning chest(s)...") # Debug message
 		for chest_data in self.pending_chests:
-			Chest(
+			chest = Chest(
 				assets=chest_data['assets'],
 				pos=chest_data['pos'],
 				group=[self.all_sprites, self.collision_sprites, self.item_sprites]
 			)
+			self.chests.append(chest)
 		self.pending_chests = []
 	
-	def startup_clouds(self):
-		# Safety check for horizon_y
-		if not hasattr(self, 'horizon_y'):
-			self.horizon_y = WINDOW_HEIGHT / 2
-		for i in range(40):
-			surf = choice(self.cloud_surfs)
-			surf = pygame.transform.scale2x(surf) if randint(0,5) > 3 else surf
-			x = randint(self.level_limits['left'], self.level_limits['right'])
-			y = self.horizon_y - randint(-50,600)
-			Cloud((x,y), surf, self.all_sprites, self.level_limits['left'])
+	def capture_frame(self, darken = 0, blur = 1):
+		# the world and HUD without the pause button, for the pause and end screens
+		self.all_sprites.custom_draw(self.player)
+		self.draw_player_health_bar()
+		self.draw_coin_hud()
+		self.inventory.display()
+		self.draw_minimap()
+		return frozen_frame(self.display_surface, darken, blur)
+
+	def draw_paused(self):
+		if self.paused_frame is None:
+			# the world is frozen, draw it once and keep a copy
+			self.paused_frame = self.capture_frame(PAUSE_DARKEN, PAUSE_BLUR)
+			self.display_surface.blit(self.paused_frame, (0, 0))
+			self.option_menu.draw()
+			self.dirty_rects = None
+			return
+
+		# only the board changes while paused
+		menu_rect = self.option_menu.menu_rect()
+		self.display_surface.blit(self.paused_frame, menu_rect, menu_rect)
+		self.option_menu.draw()
+		self.dirty_rects = [menu_rect]
 
 	def run(self, dt):
-		events = pygame.event.get()
-		menu_action = self.option_menu.handle_events(events)
-		if menu_action == 'menu': return
-
-		for event in events:
-			if event.type == pygame.QUIT: pygame.quit(); sys.exit()
-			if event.type == pygame.KEYDOWN:
-				if event.key == pygame.K_ESCAPE: self.switch(action='menu'); return
-			if not self.option_menu.active:
+		with profiler.section('events'):
+			events = pygame.event.get()
+			menu_action = self.option_menu.handle_events(events)
+			if menu_action == 'menu': return
+
+			for event in events:
+				if event.type == pygame.QUIT: pygame.quit(); sys.exit()
 				if event.type == pygame.KEYDOWN:
-					if event.key == pygame.K_z: self.inventory.toggle()
-					if event.key == pygame.K_f:
-						if not self.check_interaction(): self.player.start_attack()
-			if event.type == self.cloud_timer:
-				surf = choice(self.cloud_surfs)
-				surf = pygame.transform.scale2x(surf) if randint(0,5) > 3 else surf
-				x = self.level_limits['right'] + randint(100,300)
-				y = self.horizon_y - randint(-50,600)
-				Cloud((x,y), surf, self.all_sprites, self.level_limits['left'])
+					if event.key == pygame.K_ESCAPE: self.switch(action='menu'); return
+				if not self.option_menu.active:
+					profiler.handle_event(event)
+					if event.type == pygame.KEYDOWN:
+						if event.key == pygame.K_z: self.inventory.toggle()
+						if event.key == pygame.K_m: self.minimap.toggle()
+						if event.key == pygame.K_F3: self.debug_active = not self.debug_active
+						if event.key == pygame.K_f:
+							if not self.check_interaction(): self.player.start_attack()
 
 		if self.option_menu.active:
-			self.display_surface.fill(SKY_COLOR)
-			self.all_sprites.custom_draw(self.player)
-			self.draw_player_health_bar()
-			self.draw_coin_hud()
-			self.inventory.display()
-			self.option_menu.draw()
+			with profiler.section('paused'):
+				self.draw_paused()
 			return
-
+		self.paused_frame = None
+		self.dirty_rects = None
+
+		with profiler.section('update'):
+			if not self.inventory.visible:
+				self.update_sprites(dt)
+			else:
+				self.inventory.update()
+				self.update_sprites(dt, include_player = False)
 		if not self.inventory.visible:
-			self.all_sprites.update(dt)
-			self.player_attack()
-		else:
-			self.inventory.update()
-			for sprite in self.all_sprites:
-				if not isinstance(sprite, Player): sprite.update(dt)
-
-		self.check_boss_defeat()
-  
-		self.get_coins()
-		self.get_damage()
-		self.tooth_attack_damage()
+			with profiler.section('player_attack'):
+				self.player_attack()
+
+		with profiler.section('check_boss_defeat'):
+			self.check_boss_defeat()
+		with profiler.section('get_coins'):
+			self.get_coins()
+		with profiler.section('get_damage'):
+			self.get_damage()
+		with profiler.section('tooth_attack_damage'):
+			self.tooth_attack_damage()
 
 		if self.player.health <= 0:
 			self.respawn_player()
 
-		self.display_surface.fill(SKY_COLOR)
-		self.all_sprites.custom_draw(self.player)
-		self.draw_player_health_bar()
-		self.draw_coin_hud()
-		self.inventory.display()
-		self.option_menu.draw()
+		with profiler.section('custom_draw'):
+			self.all_sprites.custom_draw(self.player)
+		with profiler.section('hud'):
+			self.draw_player_health_bar()
+			self.draw_coin_hud()
+			self.inventory.display()
+			self.draw_minimap()
+			if self.debug_active: self.draw_debug()
+			self.option_menu.draw()
 
 class CameraGroup(pygame.sprite.Group):
 	def __init__(self, level_limits):
 		super().__init__()
-		self.display_surface = pygame.display.get_surface()
+		self.display_surface = get_target()
 		self.offset = vector()
 		self.level_limits = level_limits
 		self.camera_rect = pygame.Rect(WINDOW_WIDTH / 4, WINDOW_HEIGHT / 4, WINDOW_WIDTH / 2, WINDOW_HEIGHT / 2)
 		self.horizon_y = WINDOW_HEIGHT / 2 + 100 
-
-	def draw_horizon(self):
-		horizon_pos = self.horizon_y - self.offset.y
-
-		if horizon_pos < WINDOW_HEIGHT:
-			sea_rect = pygame.Rect(0,horizon_pos,WINDOW_WIDTH,WINDOW_HEIGHT - horizon_pos)
-			pygame.draw.rect(self.display_surface, SEA_COLOR, sea_rect)
-
-			h_rect1 = pygame.Rect(0,horizon_pos - 10,WINDOW_WIDTH,10)
-			h_rect2 = pygame.Rect(0,horizon_pos - 16,WINDOW_WIDTH,4)
-			h_rect3 = pygame.Rect(0,horizon_pos - 20,WINDOW_WIDTH,2)
-			pygame.draw.rect(self.display_surface, HORIZON_TOP_COLOR, h_rect1)
-			pygame.draw.rect(self.display_surface, HORIZON_TOP_COLOR, h_rect2)
-			pygame.draw.rect(self.display_surface, HORIZON_TOP_COLOR, h_rect3)
-			pygame.draw.line(self.display_surface, HORIZON_COLOR, (0,horizon_pos), (WINDOW_WIDTH,horizon_pos), 3)
-
-		if horizon_pos < 0:
-			self.display_surface.fill(SEA_COLOR)
+		self.clouds = [] # CloudLayers drawn behind everything, far to near
+		self.front_effects = None # Effects drawn over everything (particles)
+		self.set_scale(RENDER_SCALE)
+		self.added = 0 # sprites added so far, spreads the dormant updates over DORMANT_TICK frames
+
+		# sprites sorted by layer, rebuilt only when the group changes
+		self.sorted_sprites = None
+		self.health_bar_sprites = []
+		self.health_bar_draw = {} # sprite type -> bar draw method or None
+
+	def set_scale(self, scale):
+		# above 1 the world is drawn on a smaller canvas and scaled up once per frame
+		self.scale = scale
+		self.canvas = None
+		if scale > 1:
+			self.canvas = canvas((WINDOW_WIDTH // scale, WINDOW_HEIGHT // scale), self.display_surface)
+
+	def add_internal(self, sprite, layer = None):
+		super().add_internal(sprite, layer)
+		self.sorted_sprites = None
+		# fixed for the sprite's lifetime, kills of other sprites do not move it to another frame
+		sprite.tick_phase = self.added % DORMANT_TICK
+		self.added += 1
+
+	def remove_internal(self, sprite):
+		super().remove_internal(sprite)
+		self.sorted_sprites = None
+
+	def health_bar(self, sprite):
+		sprite_type = type(sprite)
+		if sprite_type not in self.health_bar_draw:
+			draw = None
+			if hasattr(sprite, 'health') and not isinstance(sprite, Player):
+				draw = getattr(sprite_type, 'draw_small_health_bar', None) or getattr(sprite_type, 'draw_boss_health_bar', None)
+			self.health_bar_draw[sprite_type] = draw
+		return self.health_bar_draw[sprite_type]
+
+	def draw_order(self):
+		if self.sorted_sprites is None:
+			# sorted is stable, so sprites within a layer keep the group order
+			layers = set(LEVEL_LAYERS.values())
+			self.sorted_sprites = sorted((sprite for sprite in self if sprite.z in layers), key = lambda sprite: sprite.z)
+			self.health_bar_sprites = [sprite for sprite in self.sorted_sprites if self.health_bar(sprite)]
+		return self.sorted_sprites
 
 	def custom_draw(self, player):
 		if player.rect.left < self.camera_rect.left: self.camera_rect.left = player.rect.left
@@ -417,27 +609,49 @@ class CameraGroup(pygame.sprite.Group):
 		if self.offset.x < self.level_limits['left']: self.offset.x = self.level_limits['left']
 		if self.offset.x > self.level_limits['right'] - WINDOW_WIDTH: self.offset.x = self.level_limits['right'] - WINDOW_WIDTH
 
-		# Draw clouds (no parallax)
-		for sprite in self:
-			if sprite.z == LEVEL_LAYERS['clouds']:
-				offset_rect = sprite.rect.copy()
-				offset_rect.center -= self.offset
-				self.display_surface.blit(sprite.image, offset_rect)
-
-		# Draw horizon
-		self.draw_horizon()
-
-		# Draw everything else by layer order
-		for layer in LEVEL_LAYERS.values():
-			for sprite in self:
-				if sprite.z == layer and sprite.z != LEVEL_LAYERS['clouds']:
-					offset_rect = sprite.rect.copy()
-					offset_rect.center -= self.offset
-					self.display_surface.blit(sprite.image, offset_rect)
-
-					# Draw health bars on top of enemies (will be drawn when processing 'main' layer)
-					if hasattr(sprite, 'health') and not isinstance(sprite, Player):
-						if hasattr(sprite, 'draw_small_health_bar'):
-							sprite.draw_small_health_bar(self.display_surface, self.offset)
-						elif hasattr(sprite, 'draw_boss_health_bar'):
-							sprite.draw_boss_health_bar(self.display_surface, self.offset)
\ No newline at end of file
+		# the world goes on the low resolution canvas if there is one
+		target = self.canvas if self.canvas is not None else self.display_surface
+		scale = self.scale
+
+		# Sky, horizon and sea in one blit
+		backdrop = get_backdrop(scale)
+		horizon_pos = (self.horizon_y - self.offset.y) / scale
+		backdrop.draw(target, horizon_pos)
+
+		# Parallax clouds, behind the horizon bands like before the backdrop strip
+		sky_rect = backdrop.sky_rect(horizon_pos, above_bands = True)
+		if self.clouds and sky_rect.height:
+			target.set_clip(sky_rect)
+			for layer in self.clouds:
+				layer.draw(target, self.offset.x, horizon_pos, scale)
+			target.set_clip(None)
+
+		# Draw everything else by layer order, batched into blits calls
+		offset_x, offset_y = int(self.offset.x), int(self.offset.y)
+		view_rect = pygame.Rect(offset_x, offset_y, WINDOW_WIDTH, WINDOW_HEIGHT)
+		if scale > 1:
+			visible = [sprite for sprite in self.draw_order() if view_rect.colliderect(sprite.rect)]
+			target.blits(
+				[(scaled_image(sprite.image, scale), ((sprite.rect.x - offset_x) // scale, (sprite.rect.y - offset_y) // scale)) for sprite in visible],
+				doreturn = False)
+			draw_scaled(self.display_surface, target)
+
+			# full resolution health bars on top of the scaled world
+			for sprite in self.health_bar_sprites:
+				self.health_bar_draw[type(sprite)](sprite, self.display_surface, self.offset)
+		else:
+			# a health bar goes right after its sprite, so later layers (palms, water) still cover it
+			bars = self.health_bar_draw
+			blits = []
+			for sprite in self.draw_order():
+				if view_rect.colliderect(sprite.rect):
+					blits.append((sprite.image, (sprite.rect.x - offset_x, sprite.rect.y - offset_y)))
+				draw_bar = bars[type(sprite)]
+				if draw_bar:
+					if blits:
+						target.blits(blits, doreturn = False)
+						blits = []
+					draw_bar(sprite, target, self.offset)
+			target.blits(blits, doreturn = False)
+
+		if self.front_effects: self.front_effects.draw(self.display_surface, self.offset)
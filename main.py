@@ -1,4 +1,7 @@
-import pygame, sys, os, json
+from time import perf_counter
+IMPORT_START = perf_counter() # the module imports below count toward the startup time
+
+import pygame, sys, os, json, argparse
 from pygame.math import Vector2 as vector
 
 from settings import *
@@ -10,41 +13,58 @@ from menu import MainMenu
 from end_menu import EndMenu
 from editor import Editor
 from level import Level
+from tile_registry import land_lookup
+import render
+from profiler import profiler, startup, resident_memory
 
 from os import walk
 
 class Main:
 	def __init__(self):
-		pygame.init()
-		self.display_surface = pygame.display.set_mode((WINDOW_WIDTH, WINDOW_HEIGHT))
+		with startup.phase('pygame.init'):
+			pygame.init()
+		with startup.phase('display'):
+			# the sdl2 backend opens its own window, the display mode then only serves the editor and surface conversion
+			flags = pygame.HIDDEN if RENDER_BACKEND == 'sdl2' else 0
+			self.display_surface = pygame.display.set_mode((WINDOW_WIDTH, WINDOW_HEIGHT), flags)
+			self.target = render.init(RENDER_BACKEND)
 		self.clock = pygame.time.Clock()
-		self.imports()
+		with startup.phase('Main.imports'):
+			self.imports()
 
 		self.menu_active = True
 		self.editor_active = False 
 		self.level_active = False
 		self.level = None 
 		
-		self.level_grid = self.load_level_grid() 
+		with startup.phase('level JSON'):
+			self.level_grid = self.load_level_grid() 
 
 		self.music_channel = pygame.mixer.find_channel()
 		
-		self.menu = MainMenu(self.menu_music, self.level_sounds) 
+		with startup.phase('MainMenu'):
+			self.menu = MainMenu(self.menu_music, self.level_sounds) 
 		self.end_menu_active = False
 		self.end_menu = None
 		
 		self.music_channel.play(self.menu_music, loops=-1) 
 		
-		self.editor = Editor(self.land_tiles, self.switch, self.level_grid)
+		with startup.phase('Editor'):
+			self.editor = Editor(self.land_tiles, self.switch, self.level_grid)
+		self.static_cache = {} # play-test terrain / water sprites per editor chunk
 		self.editor.editor_music.stop() 
 
 		surf = load('assets/graphics/cursors/mouse.png').convert_alpha()
 		cursor = pygame.cursors.Cursor((0,0), surf)
-		pygame.mouse.set_cursor(cursor)
+		try:
+			pygame.mouse.set_cursor(cursor)
+		except pygame.error:
+			pass # no cursor support (headless video driver)
 
 	def imports(self):
 		# terrain
 		self.land_tiles = import_folder_dict('assets/graphics/terrain/land')
+		self.land_lookup = land_lookup(self.land_tiles)
 		self.water_bottom = load('assets/graphics/terrain/water/water_bottom.png').convert_alpha()
 		self.water_top_animation = import_folder('assets/graphics/terrain/water/animation')
 
@@ -121,18 +141,46 @@ class Main:
 		}
   
 		# sounds
-		self.menu_music = pygame.mixer.Sound('assets/audio/SuperHero.ogg')
-  
-		self.level_sounds = {
-			'coin': pygame.mixer.Sound('assets/audio/coin.wav'),
-			'hit': pygame.mixer.Sound('assets/audio/hit.wav'),
-			'jump': pygame.mixer.Sound('assets/audio/jump.wav'),
-			'music': pygame.mixer.Sound('assets/audio/SuperHero.ogg'), 
-			'chest_locked': pygame.mixer.Sound('assets/audio/wooden-thud-mono.mp3'),
-			'chest_open': pygame.mixer.Sound('assets/audio/chest-opening.mp3'),
+		with startup.phase('assets/audio'):
+			self.menu_music = pygame.mixer.Sound('assets/audio/SuperHero.ogg')
+
+			self.level_sounds = {
+				'coin': pygame.mixer.Sound('assets/audio/coin.wav'),
+				'hit': pygame.mixer.Sound('assets/audio/hit.wav'),
+				'jump': pygame.mixer.Sound('assets/audio/jump.wav'),
+				'music': self.menu_music, # the same track, loaded once
+				'chest_locked': pygame.mixer.Sound('assets/audio/wooden-thud-mono.mp3'),
+				'chest_open': pygame.mixer.Sound('assets/audio/chest-opening.mp3'),
+			}
+
+		# level assets, shared by every Level built from now on
+		self.level_assets = {
+			'land': self.land_lookup,
+			'water bottom': self.water_bottom,
+			'water top': self.water_top_animation,
+			'gold': self.gold,
+			'silver': self.silver,
+			'diamond': self.diamond,
+			'particle': self.particle,
+			'palms': self.palms,
+			'spikes': self.spikes,
+			'tooth': self.tooth,
+			'shell': self.shell,
+			'player': self.player_graphics,
+			'pearl': self.pearl_surf,
+			'pearl_destroyed': self.pearl_destroyed,
+			'clouds': self.clouds,
+			'small_health_bar': self.small_health_bar,
+			'player_health_bar': self.player_health_bar,
+			'boss_health_bar': self.boss_health_bar,
+			'items': self.item_assets,
+			'chest': self.chest_assets, 
+			'item_effects': self.item_effects,
+			'inventory': self.inventory_assets,
+			'crabby': self.crabby, 
+			'hud_assets': self.hud_assets,
 		}
-  
-		self.level_sounds['music'] = self.menu_music
+
 
 	def load_level_grid(self):
 		filename = "saved_level_grid.json"
@@ -172,6 +220,19 @@ class Main:
 			if grid:
 				self.level_grid = grid 
 		
+		elif action == 'playtest':
+			# straight from the editor canvas, leaving the level goes back to the editor
+			self.menu_active = False
+			self.editor_active = False
+			self.level_active = True
+			self.end_menu_active = False
+			self.end_menu = None
+			self.editor.editor_music.stop()
+			self.music_channel.play(self.menu_music, loops=-1)
+
+			back_to_editor = lambda grid = None, action = None: self.switch(grid, 'editor' if action == 'menu' else action)
+			self.level = Level(grid, back_to_editor, self.level_assets, self.level_sounds, self.static_cache, self.editor.chunk_key)
+
 		elif action == 'new_game' or grid:
 			if not self.level_grid:
 				print("Cannot start game: self.level_grid is empty.")
@@ -183,50 +244,23 @@ class Main:
 			self.end_menu_active = False
 			self.end_menu = None
    
-			self.level = Level(
-				self.level_grid, 
-				self.switch, 
-				{
-					'land': self.land_tiles,
-					'water bottom': self.water_bottom,
-					'water top': self.water_top_animation,
-					'gold': self.gold,
-					'silver': self.silver,
-					'diamond': self.diamond,
-					'particle': self.particle,
-					'palms': self.palms,
-					'spikes': self.spikes,
-					'tooth': self.tooth,
-					'shell': self.shell,
-					'player': self.player_graphics,
-					'pearl': self.pearl_surf,
-					'pearl_destroyed': self.pearl_destroyed,
-					'clouds': self.clouds,
-					'small_health_bar': self.small_health_bar,
-					'player_health_bar': self.player_health_bar,
-					'boss_health_bar': self.boss_health_bar,
-					'items': self.item_assets,
-					'chest': self.chest_assets, 
-					'item_effects': self.item_effects,
-					'inventory': self.inventory_assets,
-					'crabby': self.crabby, 
-					'hud_assets': self.hud_assets,
-				},
-				self.level_sounds 
-			)
+			self.level = Level(self.level_grid, self.switch, self.level_assets, self.level_sounds)
 		
 		elif action == 'editor':
 			self.menu_active = False
 			self.level_active = False
+			self.end_menu_active = False
 			self.editor_active = True
+			self.level = None
+			self.end_menu = None
 			self.music_channel.stop() 
 			self.editor.editor_music.play(loops = -1)
    
 		elif action == 'end_game':
-			background_level_capture = None
-			if self.level: # Get coin data from the level
+			background = None
+			if self.level: # Get coin data and a last frame from the level
 				coin_counts = self.level.player.coin_counts
-				background_level_capture = self.level
+				background = self.level.capture_frame(END_DARKEN, END_BLUR)
 				self.level = None # Clear the level
 			else:
 				coin_counts = {} # Fallback
@@ -235,12 +269,14 @@ class Main:
 			self.editor_active = False
 			self.level_active = False
 			self.end_menu_active = True
-			self.end_menu = EndMenu(coin_counts, self.switch, background_level_capture)
+			self.end_menu = EndMenu(coin_counts, self.switch, background)
 			
 	def run(self):
 		while True:
 			dt = self.clock.tick(60) / 1000
 			dt = min(dt, 1 / 30)
+			dirty_rects = None
+			profiler.start_frame()
 			
 			if self.menu_active:
 				action = self.menu.run()
@@ -260,17 +296,53 @@ class Main:
 
 			elif self.editor_active:
 				self.editor.run(dt)
+				if self.target is not self.display_surface:
+					render.draw_scaled(self.target, self.display_surface) # the editor draws in software
 			
 			elif self.level_active and self.level:
-				self.level.run(dt)
+				level = self.level
+				level.run(dt)
+				dirty_rects = level.dirty_rects
     
 			elif self.end_menu_active and self.end_menu:
-				action = self.end_menu.run()
+				end_menu = self.end_menu
+				action = end_menu.run()
+				dirty_rects = end_menu.dirty_rects
 				if action == 'menu':
 					self.switch(action='menu')
-				
-			pygame.display.update()
+
+			# F4 overlay over the level and the editor
+			if profiler.enabled and (self.editor_active or self.level_active):
+				with profiler.section('profiler'):
+					profiler.draw(self.target)
+				dirty_rects = None
+
+			# static scenes only present what they redrew, None is the whole frame
+			with profiler.section('present'):
+				render.present(self.target, dirty_rects)
+			profiler.end_frame()
+
+def profile_startup(budget):
+	# builds Main and draws the first menu frame with every phase traced, exits with 1 when it took longer than budget ms
+	startup.add('module imports', (perf_counter() - IMPORT_START) * 1000, resident_memory())
+	startup.active = True
+	main = Main()
+	with startup.phase('first menu frame'):
+		main.menu.draw()
+	total = (perf_counter() - IMPORT_START) * 1000
+	startup.active = False
+
+	print(startup.report(total, budget))
+	pygame.quit()
+	sys.exit(0 if total <= budget else 1)
 
 if __name__ == '__main__':
+	parser = argparse.ArgumentParser(description = 'Treasure Hunter')
+	parser.add_argument('--profile-startup', action = 'store_true', help = 'print the time and memory of each startup phase and asset folder, then exit')
+	parser.add_argument('--budget', type = float, default = STARTUP_BUDGET, help = 'ms allowed until the first menu frame with --profile-startup')
+	args = parser.parse_args()
+
+	if args.profile_startup:
+		profile_startup(args.budget)
 	main = Main()
 	main.run()
\ No newline at end of file
@@ -1,12 +1,14 @@
 import pygame, sys
 from pygame.image import load
 from settings import *
+from render import get_target, present
 from option_menu import OptionMenu
 from about_menu import AboutMenu
+from profiler import startup
 
 class MainMenu:
   def __init__(self, music_track, sfx_sounds):
-    self.display = pygame.display.get_surface()
+    self.display = get_target()
     self.font = pygame.font.Font(FONT, 48)
     self.bg = load('assets/graphics/menu/bg.png').convert_alpha()
     self.editor_button_img = load('assets/graphics/menu/small-button.png').convert_alpha()
@@ -22,13 +24,19 @@ class MainMenu:
     }
 
     # Create OptionMenu instance, passing the audio tracks
-    self.option_menu = OptionMenu(music_track=music_track, sfx_sounds=sfx_sounds)
+    with startup.phase('OptionMenu'):
+      self.option_menu = OptionMenu(music_track=music_track, sfx_sounds=sfx_sounds)
     self.option_menu.from_menu = True
     self.option_menu.active = False
     
-    self.about_menu = AboutMenu()
+    with startup.phase('AboutMenu'):
+      self.about_menu = AboutMenu()
     self.about_menu.active = False
 
+    # The menu is static, it is only redrawn when this state changes
+    self.clock = pygame.time.Clock()
+    self.drawn_state = None
+
   def draw_button(self, text, rect):
     stroke_color = (51, 50, 61)
     text_color = (255, 255, 255)
@@ -54,8 +62,14 @@ class MainMenu:
         txt_surf = self.font.render(text, True, text_color)
         self.display.blit(txt_surf, txt_surf.get_rect(center=center_pos))
 
+  def menu_state(self):
+    return (self.option_menu.active, self.about_menu.active, OptionMenu.music_volume, OptionMenu.sfx_volume, self.about_menu.scroll_y)
+
   def run(self):
+    self.drawn_state = None # the screen was drawn by another scene
     while True:
+      self.clock.tick(60)
+
       # --- 1. HANDLE EVENTS ---
       events = pygame.event.get()
 
@@ -68,6 +82,9 @@ class MainMenu:
           pygame.quit()
           sys.exit()
 
+        if event.type == pygame.WINDOWEXPOSED:
+          self.drawn_state = None
+
         if event.type == pygame.MOUSEBUTTONDOWN and event.button == 1:
           if option_consumed_click or about_consumed_click:
             continue
@@ -90,15 +107,22 @@ class MainMenu:
                   return "quit"
 
       # --- 2. DRAWING ---
-      self.display.blit(self.bg, (0, 0))
+      state = self.menu_state()
+      if state == self.drawn_state:
+        continue
+      self.drawn_state = state
+      self.draw()
+
+  def draw(self):
+    self.display.blit(self.bg, (0, 0))
 
-      # Draw main menu buttons only when options not visible
-      if not self.option_menu.active and not self.about_menu.active:
-        for name, rect in self.buttons.items():
-          self.draw_button(name, rect)
+    # Draw main menu buttons only when options not visible
+    if not self.option_menu.active and not self.about_menu.active:
+      for name, rect in self.buttons.items():
+        self.draw_button(name, rect)
 
-      # Draw other menus
-      self.option_menu.draw()
-      self.about_menu.draw()
+    # Draw other menus
+    self.option_menu.draw()
+    self.about_menu.draw()
 
-      pygame.display.update()
\ No newline at end of file
+    present(self.display)
\ No newline at end of file
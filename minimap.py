@@ -0,0 +1,90 @@
+import pygame
+
+from settings import *
+from render import dynamic
+
+BOSS_ID = 23
+CHEST_ID = 19
+
+def cell_color(has_terrain, has_water, coin, enemy, item):
+	# the one color a cell gets on the map, takes a CanvasTile state
+	if enemy: return MINIMAP_COLORS['boss' if enemy == BOSS_ID else 'enemy']
+	if item: return MINIMAP_COLORS['chest' if item == CHEST_ID else 'item']
+	if coin: return MINIMAP_COLORS['coin']
+	if has_terrain: return MINIMAP_COLORS['terrain']
+	if has_water: return MINIMAP_COLORS['water']
+	return None
+
+class Minimap:
+	def __init__(self, topright, scale = MINIMAP_SCALE, size = MINIMAP_SIZE):
+		self.scale = scale
+		self.visible = True
+
+		# whole level, grown when a cell outside it is painted
+		self.area = pygame.Rect(0, 0, 0, 0) # in cells
+		self.map_surf = pygame.Surface((0, 0))
+
+		# fixed size window, drawing cost does not depend on the level size
+		self.window = dynamic(pygame.Surface(size)) # redrawn every frame
+		self.rect = self.window.get_rect(topright = topright)
+
+	def toggle(self):
+		self.visible = not self.visible
+
+	def reserve(self, cells):
+		# make the map cover all cells, with some slack so painting outward does not regrow every time
+		cells = list(cells)
+		if not cells:
+			return
+		left = min(cell[0] for cell in cells)
+		top = min(cell[1] for cell in cells)
+		needed = pygame.Rect(left, top, max(cell[0] for cell in cells) - left + 1, max(cell[1] for cell in cells) - top + 1)
+		if self.area.contains(needed):
+			return
+
+		slack = CHUNK_SIZE
+		area = needed.union(self.area) if self.area.size != (0, 0) else needed
+		area = area.inflate(slack * 2, slack * 2)
+		map_surf = pygame.Surface((area.width * self.scale, area.height * self.scale))
+		map_surf.fill(MINIMAP_COLORS['background'])
+		map_surf.blit(self.map_surf, ((self.area.x - area.x) * self.scale, (self.area.y - area.y) * self.scale))
+		self.area, self.map_surf = area, map_surf
+
+	def paint(self, cells):
+		# cells: iterable of (cell, color), color None clears the cell
+		cells = list(cells)
+		self.reserve(cell for cell, _ in cells)
+		scale, left, top = self.scale, self.area.x, self.area.y
+		background = MINIMAP_COLORS['background']
+		fill = self.map_surf.fill
+		for (col, row), color in cells:
+			fill(color or background, ((col - left) * scale, (row - top) * scale, scale, scale))
+
+	def to_map(self, world_pos):
+		# world pixels -> map pixels
+		return (
+			world_pos[0] * self.scale / TILE_SIZE - self.area.x * self.scale,
+			world_pos[1] * self.scale / TILE_SIZE - self.area.y * self.scale)
+
+	def draw(self, surface, view_rect, markers = ()):
+		# view_rect: visible world area in pixels, markers: (world pos, color name) pairs
+		if not self.visible:
+			return
+
+		view_left, view_top = self.to_map(view_rect.topleft)
+		view = pygame.Rect(view_left, view_top, view_rect.width * self.scale / TILE_SIZE, view_rect.height * self.scale / TILE_SIZE)
+
+		# the part of the map around the view, kept inside the map where possible
+		crop = self.window.get_rect(center = view.center)
+		crop.clamp_ip(self.map_surf.get_rect())
+
+		self.window.fill(MINIMAP_COLORS['background'])
+		self.window.blit(self.map_surf, (-crop.x, -crop.y))
+		pygame.draw.rect(self.window, MINIMAP_COLORS['view'], view.move(-crop.x, -crop.y), 1)
+		for pos, color in markers:
+			x, y = self.to_map(pos)
+			pygame.draw.circle(self.window, MINIMAP_COLORS[color], (x - crop.x, y - crop.y), 3)
+
+		# the frame is drawn inside the window, so the screen only gets one blit
+		pygame.draw.rect(self.window, BUTTON_LINE_COLOR, self.window.get_rect(), 2)
+		surface.blit(self.window, self.rect)
@@ -1,5 +1,6 @@
 import pygame
 from settings import *
+from render import get_target
 
 class OptionMenu:
   # Default Volumes
@@ -11,21 +12,29 @@ class OptionMenu:
   dragging_music = False
   dragging_sfx = False
 
+  images = None # shared surfaces, loaded by the first instance
+
   def __init__(self, state_switch_callback=None, music_track=None, sfx_sounds=None):
-    self.display_surface = pygame.display.get_surface()
+    self.display_surface = get_target()
     self.state_switch_callback = state_switch_callback  # To call main.switch
 
-    # Load images
-    self.board = pygame.image.load('assets/graphics/option-menu/option-board.png').convert_alpha()
-    self.music_on = pygame.image.load('assets/graphics/option-menu/music-on-button.png').convert_alpha()
-    self.music_off = pygame.image.load('assets/graphics/option-menu/music-off-button.png').convert_alpha()
-    self.volume_on = pygame.image.load('assets/graphics/option-menu/volume-on-button.png').convert_alpha()
-    self.volume_off = pygame.image.load('assets/graphics/option-menu/volume-off-button.png').convert_alpha()
-    self.volume_slider = pygame.image.load('assets/graphics/option-menu/volume-slider.png').convert_alpha()
-    self.toggle_slider = pygame.image.load('assets/graphics/option-menu/toggle-slider.png').convert_alpha()
-    self.continue_button = pygame.image.load('assets/graphics/option-menu/continue-button.png').convert_alpha()
-    self.exit_button = pygame.image.load('assets/graphics/option-menu/exit-button.png').convert_alpha()
-    self.pause_button = pygame.image.load('assets/graphics/option-menu/pause-button.png').convert_alpha()
+    # Load images (once, every Level builds its own OptionMenu)
+    if OptionMenu.images is None:
+      OptionMenu.images = {
+        name: pygame.image.load(f'assets/graphics/option-menu/{name.replace("_", "-")}.png').convert_alpha()
+        for name in ('option_board', 'music_on_button', 'music_off_button', 'volume_on_button', 'volume_off_button',
+                     'volume_slider', 'toggle_slider', 'continue_button', 'exit_button', 'pause_button')}
+    images = OptionMenu.images
+    self.board = images['option_board']
+    self.music_on = images['music_on_button']
+    self.music_off = images['music_off_button']
+    self.volume_on = images['volume_on_button']
+    self.volume_off = images['volume_off_button']
+    self.volume_slider = images['volume_slider']
+    self.toggle_slider = images['toggle_slider']
+    self.continue_button = images['continue_button']
+    self.exit_button = images['exit_button']
+    self.pause_button = images['pause_button']
 
     # Rect setup
     self.board_rect = self.board.get_rect(center=(WINDOW_WIDTH / 2, WINDOW_HEIGHT / 2))
@@ -121,6 +130,10 @@ class OptionMenu:
       "continue": cont_rect, "exit": exit_rect
     }
 
+  def menu_rect(self):
+    """Screen area covered by the open menu (sliders and numbers included)."""
+    return self.board_rect.unionall(list(self.button_rects.values()))
+
   def draw_pause_button(self):
     self.display_surface.blit(self.pause_button, self.pause_rect)
     return self.pause_rect
@@ -0,0 +1,219 @@
+import pygame, os, csv
+import numpy as np
+from collections import deque
+from contextlib import nullcontext
+from time import perf_counter, strftime
+
+from settings import *
+from render import dynamic
+
+PANEL_WIDTH = 340
+GRAPH_HEIGHT = 80 # px of the frame time graph, the top is two frames at 60 fps
+FRAME_BUDGET = 1000 / 60 # ms
+
+class Section:
+	# times one phase, a phase that runs several times in a frame adds up
+	__slots__ = ('profiler', 'name', 'start')
+
+	def __init__(self, profiler, name):
+		self.profiler = profiler
+		self.name = name
+
+	def __enter__(self):
+		self.start = perf_counter()
+
+	def __exit__(self, *exc_info):
+		self.profiler.add(self.name, perf_counter() - self.start)
+
+class Profiler:
+	# per phase frame times, kept for the last PROFILER_FRAMES frames
+	def __init__(self, frames = PROFILER_FRAMES):
+		self.enabled = PROFILER_ENABLED
+		self.frames = deque(maxlen = frames) # one {phase: ms} per frame
+		self.recorded = deque(maxlen = PROFILER_RECORD_LIMIT) # frames since profiling was switched on, for the CSV
+		self.phases = {} # phase -> None, in the order they first ran
+		self.current = {}
+		self.frame_start = None
+		self.class_names = {} # sprite class -> phase name
+
+		# overlay
+		self.null_section = nullcontext()
+		self.font = None
+		self.panel = None
+		self.rows = []
+		self.refresh = 0
+
+	def toggle(self):
+		self.enabled = not self.enabled
+		self.current = {}
+		self.frame_start = None
+		if self.enabled:
+			self.frames.clear()
+			self.recorded.clear()
+
+	def handle_event(self, event):
+		# F4 switches profiling and the overlay, F5 writes what was recorded
+		if event.type == pygame.KEYDOWN:
+			if event.key == pygame.K_F4: self.toggle()
+			if event.key == pygame.K_F5 and self.recorded: print(f"Profile written to {self.dump_csv()}")
+
+	# timing
+	def start_frame(self):
+		if self.enabled:
+			self.current = {}
+			self.frame_start = perf_counter()
+
+	def end_frame(self):
+		if not self.enabled or self.frame_start is None:
+			return
+		self.current['frame'] = perf_counter() - self.frame_start
+		frame = {name: seconds * 1000 for name, seconds in self.current.items()}
+		for name in frame:
+			self.phases.setdefault(name)
+		self.frames.append(frame)
+		self.recorded.append(frame)
+		self.frame_start = None
+
+	def section(self, name):
+		# with profiler.section('name'): ... costs one shared object while profiling is off
+		return Section(self, name) if self.enabled else self.null_section
+
+	def add(self, name, seconds):
+		self.current[name] = self.current.get(name, 0) + seconds
+
+	def update_sprite(self, sprite, dt):
+		# sprite.update timed under its class, all sprites of a class add up
+		name = self.class_names.get(type(sprite))
+		if name is None:
+			name = self.class_names[type(sprite)] = f'update {type(sprite).__name__}'
+		start = perf_counter()
+		sprite.update(dt)
+		self.add(name, perf_counter() - start)
+
+	# results
+	def stats(self):
+		# phase -> (avg, p95, p99) in ms over the window, frames a phase did not run in count as 0
+		if not self.frames:
+			return {}
+		names = [name for name in self.phases if any(name in frame for frame in self.frames)]
+		table = np.array([[frame.get(name, 0) for name in names] for frame in self.frames])
+		average = table.mean(axis = 0)
+		p95, p99 = np.percentile(table, (95, 99), axis = 0)
+		return {name: (average[index], p95[index], p99[index]) for index, name in enumerate(names)}
+
+	def dump_csv(self, path = None):
+		# one row per recorded frame, one ms column per phase (empty when it did not run), nested phases are included in their parents
+		if path is None:
+			os.makedirs(PROFILER_DIR, exist_ok = True)
+			path = os.path.join(PROFILER_DIR, f"profile-{strftime('%Y%m%d-%H%M%S')}.csv")
+		names = list(self.phases)
+		with open(path, 'w', newline = '') as file:
+			writer = csv.writer(file)
+			writer.writerow(['index'] + names)
+			for index, frame in enumerate(self.recorded):
+				writer.writerow([index] + [round(frame[name], 4) if name in frame else '' for name in names])
+		return path
+
+	# overlay
+	def draw(self, surface):
+		# frame time graph with the slowest phases below it, top right under the minimap
+		if self.panel is None:
+			try:
+				self.font = pygame.font.Font(FONT, 14)
+			except (FileNotFoundError, OSError):
+				self.font = pygame.font.Font(None, 18)
+			self.line_height = self.font.get_linesize()
+			size = (PANEL_WIDTH, GRAPH_HEIGHT + 30 + self.line_height * (PROFILER_ROWS + 2))
+			self.panel = dynamic(pygame.Surface(size))
+			self.panel.set_alpha(220)
+			self.rect = self.panel.get_rect(topright = (WINDOW_WIDTH - 20, 230))
+
+		# the text only changes every PROFILER_REFRESH frames, the graph every frame
+		self.refresh -= 1
+		if self.refresh <= 0 or not self.rows:
+			self.refresh = PROFILER_REFRESH
+			self.rows = self.render_rows()
+
+		panel = self.panel
+		panel.fill('#3e3546')
+		graph = pygame.Rect(10, 10, PANEL_WIDTH - 20, GRAPH_HEIGHT)
+		panel.fill('#2a2330', graph)
+		budget_y = graph.bottom - GRAPH_HEIGHT // 2
+		pygame.draw.line(panel, '#6e8c5a', (graph.left, budget_y), (graph.right - 1, budget_y))
+		if len(self.frames) > 1:
+			ms_per_px = 2 * FRAME_BUDGET / GRAPH_HEIGHT
+			step = (graph.width - 1) / (self.frames.maxlen - 1)
+			points = [(graph.left + index * step, graph.bottom - 1 - min(GRAPH_HEIGHT - 1, frame['frame'] / ms_per_px))
+				for index, frame in enumerate(self.frames)]
+			pygame.draw.lines(panel, '#f3d36b', False, points)
+
+		panel.blits(self.rows, doreturn = False)
+		surface.blit(panel, self.rect)
+
+	def render_rows(self):
+		# blits of the table: a header, the whole frame, then the slowest phases
+		stats = self.stats()
+		frame = stats.pop('frame', (0, 0, 0))
+		slowest = sorted(stats.items(), key = lambda item: item[1][0], reverse = True)[:PROFILER_ROWS]
+		lines = [('ms', ('avg', 'p95', 'p99'))] + [('frame', frame)] + slowest
+
+		columns = (10, PANEL_WIDTH - 150, PANEL_WIDTH - 100, PANEL_WIDTH - 50)
+		top = 20 + GRAPH_HEIGHT
+		rows = []
+		for index, (name, values) in enumerate(lines):
+			y = top + index * self.line_height
+			cells = [name] + [value if isinstance(value, str) else f'{value:.2f}' for value in values]
+			rows += [(self.font.render(cell, False, 'white'), (x, y)) for cell, x in zip(cells, columns)]
+		return rows
+
+class TracePhase:
+	# one startup phase, its row is reserved on entry so nested phases print below their parent
+	__slots__ = ('trace', 'name', 'row', 'start', 'rss')
+
+	def __init__(self, trace, name):
+		self.trace = trace
+		self.name = name
+
+	def __enter__(self):
+		self.row = len(self.trace.phases)
+		self.trace.phases.append(None)
+		self.trace.depth += 1
+		self.start = perf_counter()
+		self.rss = resident_memory()
+
+	def __exit__(self, *exc_info):
+		self.trace.depth -= 1
+		self.trace.phases[self.row] = (self.trace.depth, self.name, (perf_counter() - self.start) * 1000, resident_memory() - self.rss)
+
+def resident_memory():
+	# resident set size in bytes, counts surfaces and sounds that tracemalloc does not see, 0 without /proc
+	try:
+		with open('/proc/self/statm') as file:
+			return int(file.read().split()[1]) * os.sysconf('SC_PAGE_SIZE')
+	except (OSError, ValueError, AttributeError):
+		return 0
+
+class StartupTrace:
+	# wall time and memory of the startup phases and asset folders, only collected with --profile-startup
+	def __init__(self):
+		self.active = False
+		self.phases = [] # (depth, name, ms, memory delta in bytes)
+		self.depth = 0
+
+	def phase(self, name):
+		return TracePhase(self, name) if self.active else profiler.null_section
+
+	def add(self, name, ms, memory):
+		# a phase timed elsewhere, like the module imports before tracing could start
+		self.phases.append((self.depth, name, ms, memory))
+
+	def report(self, total, budget):
+		lines = [f"{'phase':<52} {'ms':>9} {'MB':>7}"]
+		for depth, name, ms, memory in self.phases:
+			lines.append(f"{'  ' * depth + name:<52} {ms:9.1f} {memory / 2 ** 20:7.1f}")
+		verdict = 'within' if total <= budget else 'OVER'
+		lines.append(f"{'time to first menu frame':<52} {total:9.1f}   ({verdict} the {budget:.0f} ms budget)")
+		return '\n'.join(lines)
+
+profiler = Profiler() # shared by Main, the level and the editor
+startup = StartupTrace()
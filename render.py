@@ -0,0 +1,161 @@
+import pygame, weakref
+
+from settings import *
+
+# Scenes draw onto a target with the Surface calls they already use: blit, blits, fill,
+# set_clip, get_size / get_width / get_height / get_rect and copy.
+# The software backend is the display surface itself, the sdl2 backend is a TextureTarget.
+
+dynamic_surfaces = weakref.WeakSet() # surfaces redrawn in place, uploaded on every blit
+
+def dynamic(surf):
+	# marks a surface whose pixels change after it was first drawn (minimap window, canvases)
+	dynamic_surfaces.add(surf)
+	return surf
+
+class TextureTarget:
+	# draws through pygame._sdl2.video: every surface becomes a texture once, SDL's software renderer without a GPU
+	name = 'sdl2'
+
+	def __init__(self, size, title = ''):
+		from pygame._sdl2.video import Window, Renderer, Texture
+		self.Texture = Texture
+
+		self.window = Window(title, size)
+		try:
+			self.renderer = Renderer(self.window, accelerated = 1, vsync = False)
+			self.accelerated = True
+		except RuntimeError: # no GPU driver, SDL's software renderer
+			self.renderer = Renderer(self.window, accelerated = 0)
+			self.accelerated = False
+
+		# everything is drawn into a target texture first, so the frame persists between presents like the display surface
+		self.size = size
+		self.frame = Texture(self.renderer, size, target = True)
+		self.renderer.target = self.frame
+
+		self.textures = weakref.WeakKeyDictionary() # surface -> texture
+		self.clip = None
+
+	# textures
+	def texture(self, surf):
+		texture = self.textures.get(surf)
+		if surf in dynamic_surfaces:
+			if texture is None:
+				texture = self.textures[surf] = self.Texture(self.renderer, surf.get_size(), streaming = True)
+				texture.blend_mode = 1 if surf.get_flags() & pygame.SRCALPHA else 0
+			texture.update(surf)
+		elif texture is None:
+			texture = self.textures[surf] = self.Texture.from_surface(self.renderer, surf)
+		alpha = surf.get_alpha()
+		texture.alpha = 255 if alpha is None else alpha
+		if texture.alpha < 255:
+			texture.blend_mode = 1 # SDL_BLENDMODE_BLEND, set_alpha can come after the upload
+		return texture
+
+	# Surface interface
+	def get_size(self):
+		return self.size
+
+	def get_width(self):
+		return self.size[0]
+
+	def get_height(self):
+		return self.size[1]
+
+	def get_rect(self, **kwargs):
+		rect = pygame.Rect((0, 0), self.size)
+		for name, value in kwargs.items():
+			setattr(rect, name, value)
+		return rect
+
+	def set_clip(self, rect = None):
+		self.clip = pygame.Rect(rect) if rect is not None else None
+
+	def blit(self, source, dest, area = None, special_flags = 0):
+		area = pygame.Rect(area) if area else source.get_rect()
+		dest_rect = pygame.Rect(dest[0], dest[1], area.width, area.height)
+
+		# clipping moves the source rect along with the destination
+		if self.clip is not None:
+			clipped = dest_rect.clip(self.clip)
+			if not clipped:
+				return clipped
+			area = pygame.Rect(area.x + clipped.x - dest_rect.x, area.y + clipped.y - dest_rect.y, clipped.width, clipped.height)
+			dest_rect = clipped
+
+		area = area.clip(source.get_rect())
+		if area.width <= 0 or area.height <= 0:
+			return pygame.Rect(dest_rect.topleft, (0, 0))
+		dest_rect.size = area.size
+		self.texture(source).draw(srcrect = area, dstrect = dest_rect)
+		return dest_rect
+
+	def blits(self, blit_sequence, doreturn = True):
+		rects = [self.blit(*args) for args in blit_sequence]
+		return rects if doreturn else None
+
+	def fill(self, color, rect = None, special_flags = 0):
+		rect = pygame.Rect(rect) if rect else pygame.Rect((0, 0), self.size)
+		if self.clip is not None:
+			rect = rect.clip(self.clip)
+		self.renderer.draw_color = pygame.Color(color)
+		self.renderer.fill_rect(rect)
+		return rect
+
+	def copy(self):
+		return self.renderer.to_surface()
+
+	# backend
+	def draw_scaled(self, surf):
+		# a whole surface stretched over the frame, scaled by the renderer
+		self.texture(dynamic(surf)).draw(dstrect = pygame.Rect((0, 0), self.size))
+
+	def present(self, rects = None):
+		# the renderer always presents whole frames, an empty list means nothing changed
+		if rects is not None and not rects:
+			return
+		renderer = self.renderer
+		renderer.target = None
+		self.frame.draw()
+		renderer.present()
+		renderer.target = self.frame
+
+target = None
+
+def init(backend):
+	# called by Main once the display mode is set, returns the target the scenes draw on
+	global target
+	target = None
+	if backend == 'sdl2':
+		try:
+			target = TextureTarget((WINDOW_WIDTH, WINDOW_HEIGHT), pygame.display.get_caption()[0])
+		except (ImportError, RuntimeError) as error:
+			print(f"SDL2 renderer unavailable ({error}), using the software backend.")
+	return get_target()
+
+def get_target():
+	return target if target is not None else pygame.display.get_surface()
+
+def canvas(size, destination):
+	# an offscreen surface that is redrawn every frame and scaled onto destination
+	if isinstance(destination, pygame.Surface):
+		return dynamic(pygame.Surface(size, 0, destination))
+	return dynamic(pygame.Surface(size))
+
+def draw_scaled(destination, surf):
+	# surf stretched over the whole destination
+	if isinstance(destination, pygame.Surface):
+		pygame.transform.scale(surf, destination.get_size(), destination)
+	else:
+		destination.draw_scaled(surf)
+
+def present(destination, rects = None):
+	# None presents the whole frame, otherwise only the rects (software backend)
+	if isinstance(destination, pygame.Surface):
+		if rects is None:
+			pygame.display.update()
+		elif rects:
+			pygame.display.update(rects)
+	else:
+		destination.present(rects)
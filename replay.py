@@ -0,0 +1,110 @@
+import pygame, sys, json
+from contextlib import contextmanager
+
+# Editor input as JSON: one entry per frame with the mouse position, the mouse buttons,
+# the keyboard modifiers and the keyboard / mouse events of that frame.
+# python replay.py record session.json   records an editor session until it is left
+# python benchmark.py editor --replay session.json   plays it back headless
+
+RECORDED_EVENTS = {name: getattr(pygame, name) for name in ('KEYDOWN', 'KEYUP', 'MOUSEBUTTONDOWN', 'MOUSEBUTTONUP', 'MOUSEMOTION', 'MOUSEWHEEL')}
+EVENT_NAMES = {event_type: name for name, event_type in RECORDED_EVENTS.items()}
+
+def event_data(event):
+	# the plain attributes of an event, tuples become lists
+	data = {'type': EVENT_NAMES[event.type]}
+	for name, value in event.dict.items():
+		if isinstance(value, (bool, int, float, str)):
+			data[name] = value
+		elif isinstance(value, tuple):
+			data[name] = list(value)
+	return data
+
+def make_event(data):
+	attributes = {name: tuple(value) if isinstance(value, list) else value for name, value in data.items() if name != 'type'}
+	return pygame.event.Event(RECORDED_EVENTS[data['type']], attributes)
+
+def frame_data(events, mouse, buttons, mods):
+	return {
+		'mouse': list(mouse),
+		'buttons': list(buttons),
+		'mods': mods,
+		'events': [event_data(event) for event in events if event.type in EVENT_NAMES],
+	}
+
+class Recorder:
+	def __init__(self):
+		self.frames = []
+
+	def record(self, events):
+		# called with the events of a frame before the editor reads them
+		self.frames.append(frame_data(events, pygame.mouse.get_pos(), pygame.mouse.get_pressed(), pygame.key.get_mods()))
+
+	def save(self, path):
+		with open(path, 'w') as file:
+			json.dump({'frames': self.frames}, file)
+
+class Replay:
+	# feeds recorded frames to the editor: the events through the queue, the mouse and modifiers through the editor's input functions
+	def __init__(self, frames):
+		self.frames = frames
+		self.index = 0
+		self.frame = frame_data([], (0, 0), (False, False, False), 0)
+
+	@classmethod
+	def load(cls, path):
+		with open(path) as file:
+			return cls(json.load(file)['frames'])
+
+	def next_frame(self):
+		# queues the next frame's events, False once the recording is over
+		if self.index >= len(self.frames):
+			return False
+		self.frame = self.frames[self.index]
+		self.index += 1
+		for data in self.frame['events']:
+			pygame.event.post(make_event(data))
+		return True
+
+	@contextmanager
+	def playing(self, module):
+		# module: the editor module, its mouse_pos / mouse_buttons / key_mods follow the recording meanwhile
+		inputs = {name: getattr(module, name) for name in ('mouse_pos', 'mouse_buttons', 'key_mods')}
+		module.mouse_pos = lambda: tuple(self.frame['mouse'])
+		module.mouse_buttons = lambda num_buttons = 3: tuple(bool(button) for button in self.frame['buttons'])
+		module.key_mods = lambda: self.frame['mods']
+		pygame.event.clear()
+		try:
+			yield self
+		finally:
+			for name, function in inputs.items():
+				setattr(module, name, function)
+
+def record(path):
+	# runs the editor like Main does and records every frame until the editor is left
+	from main import Main
+	import render
+
+	main = Main()
+	main.switch(action = 'editor')
+	recorder = Recorder()
+	while main.editor_active:
+		dt = min(main.clock.tick(60) / 1000, 1 / 30)
+		events = pygame.event.get()
+		if any(event.type == pygame.QUIT for event in events):
+			break
+		recorder.record(events)
+		for event in events:
+			pygame.event.post(event)
+		main.editor.run(dt)
+		if main.target is not main.display_surface:
+			render.draw_scaled(main.target, main.display_surface)
+		render.present(main.target)
+
+	recorder.save(path)
+	print(f"{len(recorder.frames)} frames recorded to {path}")
+
+if __name__ == '__main__':
+	if len(sys.argv) != 3 or sys.argv[1] != 'record':
+		print('usage: python replay.py record <session.json>')
+		sys.exit(1)
+	record(sys.argv[2])
@@ -4,6 +4,45 @@ WINDOW_WIDTH = 1280
 WINDOW_HEIGHT = 720
 ANIMATION_SPEED = 8
 
+# editor
+CHUNK_SIZE = 16 # cells per side of a cached canvas chunk
+CHUNK_MARGIN = 1 # chunks around the view that stay cached, the rest are dropped
+UNDO_LIMIT = 200000 # cell / object changes kept in the undo history
+FILL_LIMIT = 40000 # max cells a flood fill may cover
+AUTOSAVE_INTERVAL = 30000 # ms between editor autosaves (skipped when nothing changed)
+
+# level
+ACTIVATION_MARGIN = WINDOW_WIDTH // 2 # px around the camera in which enemies run their AI
+DORMANT_TICK = 4 # far away decorations update every n-th frame
+HUD_TEXT_CACHE = 64 # rendered HUD strings kept between frames
+PAUSE_DARKEN, PAUSE_BLUR = 0, 1 # frozen world behind the pause board: 0-255 shade, downscale factor (1 = sharp)
+END_DARKEN, END_BLUR = 0, 1 # same for the end screen
+RENDER_SCALE = 1 # the level world is drawn at 1 / n resolution and scaled up (2 = 640x360)
+RENDER_BACKEND = 'software' # 'software' (Surface blits) or 'sdl2' (textures through pygame._sdl2.video)
+
+# parallax clouds, far to near: camera share, wind px / s, clouds per screen width, cloud tops above the horizon
+CLOUD_LAYERS = (
+	{'parallax': 0.2, 'drift': 8, 'count': 5, 'band': (-20, 220)},
+	{'parallax': 0.45, 'drift': 16, 'count': 4, 'band': (180, 420)},
+	{'parallax': 0.75, 'drift': 26, 'count': 3, 'band': (360, 600), 'large': True},
+)
+CLOUD_KEY = (255, 0, 255) # colorkey of the cloud strips
+
+# profiler (F4 toggles, F5 writes a CSV)
+PROFILER_ENABLED = False # time the frame phases from the start
+PROFILER_FRAMES = 240 # rolling window of the averages, percentiles and graph
+PROFILER_ROWS = 14 # slowest phases listed under the graph
+PROFILER_REFRESH = 30 # frames between redraws of the table text
+PROFILER_DIR = 'profiles' # where F5 writes its CSV files
+PROFILER_RECORD_LIMIT = 36000 # frames kept for the CSV (10 minutes at 60 fps), older ones are dropped
+
+# startup
+STARTUP_BUDGET = 3000 # ms from the module imports to the first menu frame, python main.py --profile-startup fails above it
+
+# minimap
+MINIMAP_SCALE = 2 # px per cell
+MINIMAP_SIZE = (256, 128) # window on screen, the map scrolls inside it
+
 BG_IMG = ""
 FONT = "assets/fonts/static/PixelifySans-SemiBold.ttf"
 
@@ -57,7 +96,6 @@ NEIGHBOR_DIRECTIONS = {
 }
 
 LEVEL_LAYERS = {
-	'clouds': 1,
 	'ocean': 2,
 	'bg': 3,
 	'water': 4,
@@ -71,4 +109,16 @@ HORIZON_COLOR = '#f5f1de'
 HORIZON_TOP_COLOR = '#d1aa9d'
 LINE_COLOR = 'black'
 BUTTON_BG_COLOR = '#33323d'
-BUTTON_LINE_COLOR = '#f5f1de'
\ No newline at end of file
+BUTTON_LINE_COLOR = '#f5f1de'
+MINIMAP_COLORS = {
+	'background': '#33323d',
+	'terrain': '#c89f6d',
+	'water': '#92a9ce',
+	'coin': '#f4d03f',
+	'enemy': '#e74c3c',
+	'item': '#5dade2',
+	'boss': '#ff00ff',
+	'chest': '#ffffff',
+	'player': '#2ecc71',
+	'view': '#f5f1de',
+}
@@ -0,0 +1,42 @@
+from settings import *
+
+class SpatialHash:
+	def __init__(self, cell_size = TILE_SIZE * 4):
+		self.cell_size = cell_size
+		self.buckets = {} # (col, row) -> set of items
+		self.item_keys = {} # item -> bucket keys it is stored in
+
+	def keys_for(self, rect):
+		size = self.cell_size
+		return [
+			(col, row)
+			for col in range(rect.left // size, (rect.right - 1) // size + 1)
+			for row in range(rect.top // size, (rect.bottom - 1) // size + 1)]
+
+	def insert(self, item, rect):
+		keys = self.keys_for(rect)
+		self.item_keys[item] = keys
+		for key in keys:
+			self.buckets.setdefault(key, set()).add(item)
+
+	def remove(self, item):
+		for key in self.item_keys.pop(item, ()):
+			bucket = self.buckets[key]
+			bucket.discard(item)
+			if not bucket:
+				del self.buckets[key]
+
+	def move(self, item, rect):
+		if self.item_keys.get(item) != self.keys_for(rect):
+			self.remove(item)
+			self.insert(item, rect)
+
+	def query_point(self, pos):
+		return self.buckets.get((int(pos[0] // self.cell_size), int(pos[1] // self.cell_size)), set())
+
+	def query_rect(self, rect):
+		found = set()
+		for key in self.keys_for(rect):
+			if key in self.buckets:
+				found |= self.buckets[key]
+		return found
@@ -6,30 +6,42 @@ from timer import Timer
 from random import choice, randint
 
 class Generic(pygame.sprite.Sprite):
+	pool = None # set on sprites handed out by a SpritePool
+
 	def __init__(self, pos, surf, group, z = LEVEL_LAYERS['main']):
 		super().__init__(group)
 		self.image = surf
 		self.rect = self.image.get_rect(topleft = pos)
 		self.z = z
 
+	def kill(self):
+		if self.pool and self.alive():
+			self.pool.release(self)
+		super().kill()
+
+class SpritePool:
+	# short lived sprites go back here when killed and are reset instead of allocated again
+	def __init__(self, sprite_type):
+		self.sprite_type = sprite_type
+		self.free = []
+
+	def get(self, *args):
+		if self.free:
+			sprite = self.free.pop()
+			sprite.reset(*args)
+			return sprite
+		sprite = self.sprite_type(*args)
+		sprite.pool = self
+		return sprite
+
+	def release(self, sprite):
+		self.free.append(sprite)
+
 class Block(Generic):
 	def __init__(self, pos, size, group):
 		surf = pygame.Surface(size)
 		super().__init__(pos, surf, group)
 
-class Cloud(Generic):
-	def __init__(self, pos, surf, group, left_limit):
-		super().__init__(pos, surf, group, LEVEL_LAYERS['clouds'])
-		self.left_limit = left_limit
-		self.pos = vector(self.rect.topleft)
-		self.speed = randint(20,30)
-
-	def update(self, dt):
-		self.pos.x -= self.speed * dt
-		self.rect.x = round(self.pos.x)
-		if self.rect.x <= self.left_limit:
-			self.kill()
-
 class Animated(Generic):
 	def __init__(self, assets, pos, group, z = LEVEL_LAYERS['main']):
 		self.animation_frames = assets
@@ -166,6 +178,7 @@ class Tooth(Generic):
 		self.is_alerted = False
 		self.detection_radius = 250
 		self.chase_radius = 400
+		self.player_distance_sq = None # set every frame by Level.enemy_proximity
 		self.attack_rect = pygame.Rect(0, 0, 40, self.rect.height)
 
 		# Kill if spawned mid-air
@@ -177,9 +190,10 @@ class Tooth(Generic):
 		if self.hit_timer.active or not self.is_alive: return
 
 		if self.player:
-			distance = vector(self.rect.center).distance_to(self.player.rect.center)
+			distance_sq = self.player_distance_sq
+			if distance_sq is None: distance_sq = vector(self.rect.center).distance_squared_to(self.player.rect.center)
 			# Update alert status based on distance
-			self.is_alerted = distance < self.chase_radius if self.is_alerted else distance < self.detection_radius
+			self.is_alerted = distance_sq < self.chase_radius ** 2 if self.is_alerted else distance_sq < self.detection_radius ** 2
 
 		# Set status based on alert state
 		self.status = 'attack' if self.is_alerted else 'run'
@@ -343,6 +357,8 @@ class Shell(Generic):
 		self.attack_cooldown = Timer(2000)
 		self.damage_sprites = damage_sprites
 		self.attackable_sprites = attackable_sprites_group
+		self.player_distance_sq = None # set every frame by Level.enemy_proximity
+		self.pearl_pool = SpritePool(Pearl)
 
 	def damage(self, amount, direction=None):
 		if not self.hit_timer.active and self.is_alive:
@@ -413,14 +429,17 @@ class Shell(Generic):
 		if self.status == 'attack' and int(self.frame_index) == 2 and not self.has_shot and self.is_alive:
 			pearl_direction = vector(-1,0) if self.orientation == 'left' else vector(1,0)
 			offset = (pearl_direction * 50) + vector(0,-10) if self.orientation == 'left' else (pearl_direction * 20) + vector(0,-10)
-			Pearl(self.rect.center + offset, pearl_direction, self.pearl_surf, [self.drawing_group, self.damage_sprites, self.attackable_sprites], self.pearl_destroyed)
+			self.pearl_pool.get(self.rect.center + offset, pearl_direction, self.pearl_surf, [self.drawing_group, self.damage_sprites, self.attackable_sprites], self.pearl_destroyed)
 			self.has_shot = True
 
 	def get_status(self):
+		distance_sq = self.player_distance_sq
+		if distance_sq is None and self.player: distance_sq = vector(self.player.rect.center).distance_squared_to(self.rect.center)
+
 		# Priority: dead > hit > attack > idle
 		if not self.is_alive: self.status = 'destroyed'
 		elif self.hit_timer.active: self.status = 'hit'
-		elif self.player and vector(self.player.rect.center).distance_to(self.rect.center) < 500 and not self.attack_cooldown.active:
+		elif self.player and distance_sq < 500 ** 2 and not self.attack_cooldown.active:
 			self.status = 'attack'
 		else: self.status = 'idle'
 
@@ -469,21 +488,53 @@ class FallingShell(Generic):
 			self.image.set_alpha(new_alpha)
 			if new_alpha == 0: self.kill()
 
+pearl_split_cache = {}
+
+def pearl_split_frames(top, bottom):
+	# split pearl composite and its fade out, built once for all pearls
+	key = (top, bottom)
+	if key not in pearl_split_cache:
+		w, h_top = top.get_size(); _, h_bottom = bottom.get_size()
+		frames = []
+		for alpha in range(255, -1, -15):
+			surf = pygame.Surface((w, h_top + h_bottom + 5), pygame.SRCALPHA)
+			surf.blit(top, (0, 0)); surf.blit(bottom, (0, h_top + 5))
+			surf.set_alpha(alpha)
+			frames.append(surf)
+		pearl_split_cache[key] = frames
+	return pearl_split_cache[key]
+
 class Pearl(Generic):
 	def __init__(self, pos, direction, surf, group, destroyed_assets):
 		super().__init__(pos, surf, group)
-		self.mask = pygame.mask.from_surface(self.image)
-		self.pos = vector(self.rect.topleft)
-		self.direction = direction.normalize()
+		self.base_surf = surf # the flying pearl, self.image moves on to the destruction frames
+		self.mask = pygame.mask.from_surface(surf)
+		self.pos = vector()
+		self.direction = vector()
 		self.speed = 150
+		self.timer = Timer(6000)
+		self.reset(pos, direction, surf, group, destroyed_assets)
+
+	def reset(self, pos, direction, surf, group, destroyed_assets):
+		if surf is not self.base_surf: # a pooled pearl keeps its mask
+			self.base_surf = surf
+			self.mask = pygame.mask.from_surface(surf)
+		self.image = surf
+		self.rect.size = surf.get_size()
+		self.rect.topleft = pos
+		self.add(group)
+		self.pos.update(self.rect.topleft)
+		self.direction.update(direction)
+		self.direction.normalize_ip()
 		self.is_alive = True
 		self.destroyed_assets = destroyed_assets if destroyed_assets else [] # Safety check
 		self.frame_index = 0
+		self.fade_index = 0
 		self.has_split = False
 		self.all_sprites_group = group[0]
 		self.damage_group = group[1]
 		self.attackable_group = group[2]
-		self.timer = Timer(6000); self.timer.activate()
+		self.timer.activate()
 
 	def damage(self, amount):
 		if self.is_alive:
@@ -500,17 +551,17 @@ class Pearl(Generic):
 		int_frame = int(self.frame_index)
 		# Animate split and fade...
 		if int_frame == 0: self.image = self.destroyed_assets[0]
-		elif int_frame == 1 and not self.has_split:
-			top, bottom = self.destroyed_assets[1], self.destroyed_assets[2]
-			w, h_top = top.get_size(); _, h_bottom = bottom.get_size()
-			new_surf = pygame.Surface((w, h_top + h_bottom + 5), pygame.SRCALPHA)
-			new_surf.blit(top, (0, 0)); new_surf.blit(bottom, (0, h_top + 5))
-			self.image = new_surf
-			self.rect = self.image.get_rect(center = self.rect.center)
+		elif not self.has_split:
+			self.image = pearl_split_frames(self.destroyed_assets[1], self.destroyed_assets[2])[0]
+			center = self.rect.center
+			self.rect.size = self.image.get_size()
+			self.rect.center = center
 			self.has_split = True
 		elif self.frame_index >= 2:
-			new_alpha = max(0, self.image.get_alpha() - 15); self.image.set_alpha(new_alpha)
-			if new_alpha == 0: self.kill()
+			fade_frames = pearl_split_frames(self.destroyed_assets[1], self.destroyed_assets[2])
+			self.fade_index = min(self.fade_index + 1, len(fade_frames) - 1)
+			self.image = fade_frames[self.fade_index]
+			if self.fade_index == len(fade_frames) - 1: self.kill()
 
 
 	def update(self, dt):
@@ -722,6 +773,7 @@ class Crabby(Generic):
 		self.attack_duration_timer = Timer(600)
 		self.attack_rect = pygame.Rect(0, 0, 70, self.rect.height - 20)
 		self.has_attacked_this_swing = False
+		self.player_in_area = None # set every frame by Level.enemy_proximity
 
 		# Add to damage_sprites group...
 		if self in group:
@@ -741,7 +793,7 @@ class Crabby(Generic):
 		# If NOT dead or hit, determine AI state
 		if not self.player: return
 
-		player_in_area = self.boss_area.colliderect(self.player.rect)
+		player_in_area = self.player_in_area if self.player_in_area is not None else self.boss_area.colliderect(self.player.rect)
 		current_midbottom = vector(self.rect.midbottom)
 		distance_to_origin = current_midbottom.distance_to(self.original_pos)
 		next_status = self.status
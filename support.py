@@ -1,37 +1,67 @@
-import pygame, os
+import pygame, os, weakref
 from os import walk
 
+from profiler import startup
+
 def import_folder(path):
-	surface_list = []
-
-	# for folder_name, sub_folders, img_files in walk(path):
-	# 	for image_name in img_files:
-	# 		full_path = path + '/' + image_name
-	# 		image_surf = pygame.image.load(full_path).convert_alpha()
-	# 		surface_list.append(image_surf)
-	# return surface_list
-	# Check if the path exists to avoid errors
-	if not os.path.exists(path):
-		print(f"Warning: Asset path does not exist: {path}")
-		return surface_list
+	with startup.phase(path):
+		surface_list = []
 
-	# Use walk to get files and sort them to ensure correct animation order
-	for _, __, img_files in walk(path):
-		for image in sorted(img_files):
-			full_path = os.path.join(path, image)
-			image_surf = pygame.image.load(full_path).convert_alpha()
-			surface_list.append(image_surf)
-		break # Only process the top-level folder
+		# for folder_name, sub_folders, img_files in walk(path):
+		# 	for image_name in img_files:
+		# 		full_path = path + '/' + image_name
+		# 		image_surf = pygame.image.load(full_path).convert_alpha()
+		# 		surface_list.append(image_surf)
+		# return surface_list
+		# Check if the path exists to avoid errors
+		if not os.path.exists(path):
+			print(f"Warning: Asset path does not exist: {path}")
+			return surface_list
 
-	return surface_list
+		# Use walk to get files and sort them to ensure correct animation order
+		for _, __, img_files in walk(path):
+			for image in sorted(img_files):
+				full_path = os.path.join(path, image)
+				image_surf = pygame.image.load(full_path).convert_alpha()
+				surface_list.append(image_surf)
+			break # Only process the top-level folder
+
+		return surface_list
 
 def import_folder_dict(path):
-	surface_dict = {}
+	with startup.phase(path):
+		surface_dict = {}
 
-	for folder_name, sub_folders, img_files in walk(path):
-		for image_name in img_files:
-			full_path = path + '/' + image_name
-			image_surf = pygame.image.load(full_path).convert_alpha()
-			surface_dict[image_name.split('.')[0]] = image_surf
+		for folder_name, sub_folders, img_files in walk(path):
+			for image_name in img_files:
+				full_path = path + '/' + image_name
+				image_surf = pygame.image.load(full_path).convert_alpha()
+				surface_dict[image_name.split('.')[0]] = image_surf
 			
-	return surface_dict
\ No newline at end of file
+		return surface_dict
+
+def frozen_frame(surface, darken = 0, blur = 1):
+	# a copy of the screen to show behind menus, processed once
+	frame = surface.copy()
+	if blur > 1:
+		width, height = frame.get_size()
+		small = pygame.transform.smoothscale(frame, (max(1, width // blur), max(1, height // blur)))
+		frame = pygame.transform.smoothscale(small, (width, height))
+	if darken:
+		shade = 255 - darken
+		frame.fill((shade, shade, shade), special_flags = pygame.BLEND_RGB_MULT)
+	return frame
+
+scaled_cache = weakref.WeakKeyDictionary() # surface -> copy for the low resolution canvas
+
+def scaled_image(surf, scale):
+	# nearest neighbor copy made once per surface (one RENDER_SCALE per run), alpha kept in sync
+	small = scaled_cache.get(surf)
+	if small is None:
+		width, height = surf.get_size()
+		small = pygame.transform.scale(surf, (max(1, width // scale), max(1, height // scale)))
+		scaled_cache[surf] = small
+	alpha = surf.get_alpha()
+	if small.get_alpha() != alpha:
+		small.set_alpha(alpha)
+	return small
@@ -0,0 +1,21 @@
+import os, sys, subprocess
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+def profile_startup(*args):
+	# python main.py --profile-startup, headless, from the repo root so the assets and the level JSON are found
+	env = dict(os.environ, SDL_VIDEODRIVER = 'dummy', SDL_AUDIODRIVER = 'dummy')
+	return subprocess.run(
+		[sys.executable, 'main.py', '--profile-startup', *args],
+		cwd = ROOT, env = env, capture_output = True, text = True, timeout = 120)
+
+def test_time_to_menu_within_budget():
+	# STARTUP_BUDGET from settings.py is the default budget
+	result = profile_startup()
+	assert 'time to first menu frame' in result.stdout, result.stdout + result.stderr
+	assert result.returncode == 0, result.stdout
+
+def test_over_budget_fails():
+	result = profile_startup('--budget', '1')
+	assert 'OVER' in result.stdout, result.stdout + result.stderr
+	assert result.returncode == 1
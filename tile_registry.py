@@ -0,0 +1,49 @@
+from pygame.image import load
+
+from settings import *
+
+# lookup tables compiled once from EDITOR_DATA
+ITEM_STYLES = ('chest', 'key', 'red_potion', 'blue_potion', 'map')
+
+TILE_STYLES = {key: value['style'] for key, value in EDITOR_DATA.items()}
+TILE_TYPES = {key: value['type'] for key, value in EDITOR_DATA.items()}
+TILE_MENUS = {key: value['menu'] for key, value in EDITOR_DATA.items()}
+
+def tile_layer(style):
+	# the level grid layer a tile of this style is saved in
+	if style in ('terrain', 'water'): return style
+	if style == 'coin': return 'coins'
+	if style == 'enemy': return 'enemies'
+	if style in ITEM_STYLES: return 'items'
+	if style == 'palm_bg': return 'bg palms'
+	return 'fg objects'
+
+# autotile neighbors as bits, A = 1 ... H = 128
+NEIGHBOR_BITS = {name: 1 << index for index, name in enumerate(NEIGHBOR_DIRECTIONS)}
+NEIGHBOR_STRINGS = [''.join(name for name, bit in NEIGHBOR_BITS.items() if mask & bit) for mask in range(256)]
+
+def terrain_mask(value):
+	# level files store the neighbor mask, older ones the letter string
+	if isinstance(value, str):
+		return sum(NEIGHBOR_BITS.get(name, 0) for name in set(value))
+	return value
+
+def land_lookup(land_tiles):
+	# neighbor mask -> land surface, 'X' for combinations without art
+	return [land_tiles.get(NEIGHBOR_STRINGS[mask], land_tiles['X']) for mask in range(256)]
+
+TILE_LAYERS = {key: tile_layer(style) for key, style in TILE_STYLES.items()}
+PALM_BG_IDS = frozenset(key for key, style in TILE_STYLES.items() if style == 'palm_bg')
+
+preview_cache = {}
+
+def preview_surfaces(alpha = 200):
+	# loaded on first use (needs a display), alpha applied once
+	if alpha not in preview_cache:
+		surfs = {}
+		for key, value in EDITOR_DATA.items():
+			if value['preview']:
+				surfs[key] = load(value['preview']).convert_alpha()
+				surfs[key].set_alpha(alpha)
+		preview_cache[alpha] = surfs
+	return preview_cache[alpha]